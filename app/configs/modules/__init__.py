@@ -1,3 +1,3 @@
 from .ai_config import AIConfig
-from .round_status_config import RoundStatusConfig
+from .round_status_config import RoundStatusConfig, RoundStatusServer
 from .whitelist_config import WhitelistConfig
@@ -1,49 +1,156 @@
 from configs import config
 
 
+_DEFAULT_WORKERS = 4
+_DEFAULT_STREAM_EDIT_INTERVAL = 1.5
+_DEFAULT_CACHE_SIZE = 256
+_DEFAULT_CACHE_TTL = 3600
+_DEFAULT_MAX_REQUESTS = 10
+_DEFAULT_USER_REQUESTS = 5
+_DEFAULT_PRIVILEGED_REQUESTS = 20
+_DEFAULT_RATE_PERIOD = 3600
+_DEFAULT_RATE_LIMIT_PATH = "./settings/ai_rate_limits.yaml"
+_DEFAULT_QUEUE_DEADLINE = 120
+_DEFAULT_THREAD_MAX_MESSAGES = 200
+_DEFAULT_THREAD_MAX_TOKENS = 16000
+_THREAD_SCOPES = ("shared", "channel", "user")
+_DEFAULT_THREAD_CACHE_SIZE = 100
+_DEFAULT_THREAD_IDLE_TIMEOUT = 21600
+_DEFAULT_THREADS_PATH = "./settings/ai_threads.yaml"
+_DEFAULT_PROMPT_MAX_TOKENS = 500
+_DEFAULT_REPLY_FILE_THRESHOLD = 6000
+_DEFAULT_REPLY_INTERVAL = 1.0
+
+
 class AIConfig:
     def __init__(self):
         self._api_key: str = str()
         self._assistant_id: str = str()
         self._org_id: str | None = None
         self._project_id: str | None = None
+        self._base_url: str | None = None
         self._thread_id: str | None = None
         self._allowed_roles: list[int] = []
         self._main_role: int = int()
+        self._workers: int = _DEFAULT_WORKERS
+        self._streaming: bool = False
+        self._stream_edit_interval: float = _DEFAULT_STREAM_EDIT_INTERVAL
+        self._cache_enabled: bool = False
+        self._cache_size: int = _DEFAULT_CACHE_SIZE
+        self._cache_ttl: float = _DEFAULT_CACHE_TTL
+        self._max_requests: int = _DEFAULT_MAX_REQUESTS
+        self._user_requests: int = _DEFAULT_USER_REQUESTS
+        self._privileged_requests: int = _DEFAULT_PRIVILEGED_REQUESTS
+        self._role_requests: dict[int, int] = {}
+        self._rate_period: float = _DEFAULT_RATE_PERIOD
+        self._rate_limit_path: str = _DEFAULT_RATE_LIMIT_PATH
+        self._queue_deadline: float = _DEFAULT_QUEUE_DEADLINE
+        self._thread_max_messages: int = _DEFAULT_THREAD_MAX_MESSAGES
+        self._thread_max_tokens: int = _DEFAULT_THREAD_MAX_TOKENS
+        self._thread_summary: bool = False
+        self._thread_scope: str = _THREAD_SCOPES[0]
+        self._thread_cache_size: int = _DEFAULT_THREAD_CACHE_SIZE
+        self._thread_idle_timeout: float = _DEFAULT_THREAD_IDLE_TIMEOUT
+        self._threads_path: str = _DEFAULT_THREADS_PATH
+        self._prompt_max_tokens: int = _DEFAULT_PROMPT_MAX_TOKENS
+        self._prompt_truncate: bool = False
+        self._reply_file_threshold: int = _DEFAULT_REPLY_FILE_THRESHOLD
+        self._reply_interval: float = _DEFAULT_REPLY_INTERVAL
         self._load()
 
     def _load(self):
         cfg = config.load_module("ai")
         self._org_id = cfg.get("org_id")
         self._project_id = cfg.get("project_id")
+        self._base_url = cfg.get("base_url")
         self._thread_id = cfg.get("thread_id")
         self._api_key = cfg.get("api_key")
         self._assistant_id = cfg.get("assistant_id")
         self._allowed_roles = cfg.get("allowed_roles")
         self._main_role = cfg.get("main_role")
+        self._workers = cfg.get("workers") or _DEFAULT_WORKERS
+        self._streaming = bool(cfg.get("streaming"))
+        self._stream_edit_interval = max(
+            1.0, cfg.get("stream_edit_interval") or _DEFAULT_STREAM_EDIT_INTERVAL)
+        self._cache_enabled = bool(cfg.get("cache_enabled"))
+        self._cache_size = cfg.get("cache_size") or _DEFAULT_CACHE_SIZE
+        self._cache_ttl = cfg.get("cache_ttl") or _DEFAULT_CACHE_TTL
+        self._max_requests = cfg.get("max_requests") or _DEFAULT_MAX_REQUESTS
+        self._user_requests = cfg.get("user_requests") or _DEFAULT_USER_REQUESTS
+        self._privileged_requests = cfg.get("privileged_requests") or _DEFAULT_PRIVILEGED_REQUESTS
+        self._role_requests = {
+            int(role): int(budget) for role, budget in (cfg.get("role_requests") or {}).items()
+        }
+        self._rate_period = cfg.get("rate_period") or _DEFAULT_RATE_PERIOD
+        self._rate_limit_path = cfg.get("rate_limit_path") or _DEFAULT_RATE_LIMIT_PATH
+        queue_deadline = cfg.get("queue_deadline")
+        self._queue_deadline = _DEFAULT_QUEUE_DEADLINE if queue_deadline is None else queue_deadline
+        thread_max_messages = cfg.get("thread_max_messages")
+        self._thread_max_messages = (_DEFAULT_THREAD_MAX_MESSAGES if thread_max_messages is None
+                                     else thread_max_messages)
+        thread_max_tokens = cfg.get("thread_max_tokens")
+        self._thread_max_tokens = (_DEFAULT_THREAD_MAX_TOKENS if thread_max_tokens is None
+                                   else thread_max_tokens)
+        self._thread_summary = bool(cfg.get("thread_summary"))
+        self._thread_scope = cfg.get("thread_scope") or _THREAD_SCOPES[0]
+        if self._thread_scope not in _THREAD_SCOPES:
+            raise ValueError(f"ai.thread_scope must be one of {', '.join(_THREAD_SCOPES)}")
+        self._thread_cache_size = cfg.get("thread_cache_size") or _DEFAULT_THREAD_CACHE_SIZE
+        thread_idle_timeout = cfg.get("thread_idle_timeout")
+        self._thread_idle_timeout = (_DEFAULT_THREAD_IDLE_TIMEOUT if thread_idle_timeout is None
+                                     else thread_idle_timeout)
+        self._threads_path = cfg.get("threads_path") or _DEFAULT_THREADS_PATH
+        prompt_max_tokens = cfg.get("prompt_max_tokens")
+        self._prompt_max_tokens = (_DEFAULT_PROMPT_MAX_TOKENS if prompt_max_tokens is None
+                                   else prompt_max_tokens)
+        self._prompt_truncate = bool(cfg.get("prompt_truncate"))
+        reply_file_threshold = cfg.get("reply_file_threshold")
+        self._reply_file_threshold = (_DEFAULT_REPLY_FILE_THRESHOLD if reply_file_threshold is None
+                                      else reply_file_threshold)
+        self._reply_interval = cfg.get("reply_interval") or _DEFAULT_REPLY_INTERVAL
         self._isLoaded = True
 
-    def _save(self):
-        config.save_module("ai", {
+    def _dump(self) -> dict:
+        return {
             "api_key": self._api_key,
             "org_id": self._org_id,
             "project_id": self._project_id,
+            "base_url": self._base_url,
             "assistant_id": self._assistant_id,
             "thread_id": self._thread_id,
             "allowed_roles": self._allowed_roles,
-            "main_role": self._main_role
-        })
+            "main_role": self._main_role,
+            "workers": self._workers,
+            "streaming": self._streaming,
+            "stream_edit_interval": self._stream_edit_interval,
+            "cache_enabled": self._cache_enabled,
+            "cache_size": self._cache_size,
+            "cache_ttl": self._cache_ttl,
+            "max_requests": self._max_requests,
+            "user_requests": self._user_requests,
+            "privileged_requests": self._privileged_requests,
+            "role_requests": self._role_requests,
+            "rate_period": self._rate_period,
+            "rate_limit_path": self._rate_limit_path,
+            "queue_deadline": self._queue_deadline,
+            "thread_max_messages": self._thread_max_messages,
+            "thread_max_tokens": self._thread_max_tokens,
+            "thread_summary": self._thread_summary,
+            "thread_scope": self._thread_scope,
+            "thread_cache_size": self._thread_cache_size,
+            "thread_idle_timeout": self._thread_idle_timeout,
+            "threads_path": self._threads_path,
+            "prompt_max_tokens": self._prompt_max_tokens,
+            "prompt_truncate": self._prompt_truncate,
+            "reply_file_threshold": self._reply_file_threshold,
+            "reply_interval": self._reply_interval
+        }
+
+    def _save(self):
+        config.save_module("ai", self._dump())
 
     async def _async_save(self):
-        await config.async_save_module("ai", {
-            "api_key": self._api_key,
-            "org_id": self._org_id,
-            "project_id": self._project_id,
-            "assistant_id": self._assistant_id,
-            "thread_id": self._thread_id,
-            "allowed_roles": self._allowed_roles,
-            "main_role": self._main_role
-        })
+        await config.async_save_module("ai", self._dump())
 
     @property
     def api_key(self) -> str:
@@ -57,6 +164,10 @@ class AIConfig:
     def project_id(self) -> str | None:
         return self._project_id
 
+    @property
+    def base_url(self) -> str | None:
+        return self._base_url
+
     @property
     def assistant_id(self) -> str | None:
         return self._assistant_id
@@ -78,10 +189,110 @@ class AIConfig:
     def main_role(self) -> int:
         return self._main_role
 
+    @property
+    def workers(self) -> int:
+        return self._workers
+
+    @property
+    def streaming(self) -> bool:
+        return self._streaming
+
+    @property
+    def stream_edit_interval(self) -> float:
+        return self._stream_edit_interval
+
+    @property
+    def cache_enabled(self) -> bool:
+        return self._cache_enabled
+
+    @property
+    def cache_size(self) -> int:
+        return self._cache_size
+
+    @property
+    def cache_ttl(self) -> float:
+        return self._cache_ttl
+
+    @property
+    def max_requests(self) -> int:
+        return self._max_requests
+
+    @property
+    def user_requests(self) -> int:
+        return self._user_requests
+
+    @property
+    def privileged_requests(self) -> int:
+        return self._privileged_requests
+
+    @property
+    def role_requests(self) -> dict[int, int]:
+        return self._role_requests
+
+    @property
+    def rate_period(self) -> float:
+        return self._rate_period
+
+    @property
+    def rate_limit_path(self) -> str:
+        return self._rate_limit_path
+
+    @property
+    def queue_deadline(self) -> float:
+        return self._queue_deadline
+
+    @property
+    def thread_max_messages(self) -> int:
+        return self._thread_max_messages
+
+    @property
+    def thread_max_tokens(self) -> int:
+        return self._thread_max_tokens
+
+    @property
+    def thread_summary(self) -> bool:
+        return self._thread_summary
+
+    @property
+    def thread_scope(self) -> str:
+        return self._thread_scope
+
+    @property
+    def thread_cache_size(self) -> int:
+        return self._thread_cache_size
+
+    @property
+    def thread_idle_timeout(self) -> float:
+        return self._thread_idle_timeout
+
+    @property
+    def threads_path(self) -> str:
+        return self._threads_path
+
+    @property
+    def prompt_max_tokens(self) -> int:
+        return self._prompt_max_tokens
+
+    @property
+    def prompt_truncate(self) -> bool:
+        return self._prompt_truncate
+
+    @property
+    def reply_file_threshold(self) -> int:
+        return self._reply_file_threshold
+
+    @property
+    def reply_interval(self) -> float:
+        return self._reply_interval
+
     async def async_set_thread_id(self, value: str) -> None:
         self._thread_id = value
         await self._async_save()
 
+    async def async_set_max_requests(self, value: int) -> None:
+        self._max_requests = value
+        await self._async_save()
+
     async def async_set_roles(self, value: list[int]) -> None:
         self._allowed_roles = value
         await self._async_save()
@@ -1,52 +1,230 @@
 from configs import config
 
 
+_DEFAULT_SERVER_NAME = "main"
+_DEFAULT_LINK = "byond://rockhill-game.ru:51143"
+_DEFAULT_MAX_CONCURRENCY = 4
+_DEFAULT_POLL_INTERVAL = 5
+_DEFAULT_POLL_INTERVAL_MIN = 2
+_DEFAULT_POLL_INTERVAL_MAX = 60
+_DEFAULT_POLL_INTERVAL_IDLE = 30
+_DEFAULT_IDLE_AFTER = 1200
+_DEFAULT_HISTORY_PATH = "./settings/round_history.sqlite3"
+_DEFAULT_HISTORY_CAPACITY = 4320
+_DEFAULT_HISTORY_FLUSH_INTERVAL = 60
+_DEFAULT_HISTORY_RETENTION = 7 * 24 * 3600
+_DEFAULT_PUSH_HOST = "0.0.0.0"
+_DEFAULT_PUSH_PORT = 8130
+_DEFAULT_PUSH_CONSISTENCY_INTERVAL = 300
+
+
+class RoundStatusServer:
+    def __init__(self, name: str, host: str, port: int, channel: int, link: str | None = None):
+        self._name: str = name
+        self._host: str = host
+        self._port: int = port
+        self._channel: int = channel
+        self._link: str = link or _DEFAULT_LINK
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "RoundStatusServer":
+        return cls(
+            name=str(data.get("name") or _DEFAULT_SERVER_NAME),
+            host=data.get("host"),
+            port=data.get("port"),
+            channel=data.get("channel"),
+            link=data.get("link"),
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self._name,
+            "host": self._host,
+            "port": self._port,
+            "channel": self._channel,
+            "link": self._link,
+        }
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def host(self) -> str:
+        return self._host
+
+    @property
+    def port(self) -> int:
+        return self._port
+
+    @property
+    def channel(self) -> int:
+        return self._channel
+
+    @property
+    def link(self) -> str:
+        return self._link
+
+
 class RoundStatusConfig:
     def __init__(self):
-        self._host: str = str()
-        self._port: int = int()
-        self._channel: int = int()
+        self._servers: list[RoundStatusServer] = list()
+        self._max_concurrency: int = _DEFAULT_MAX_CONCURRENCY
+        self._poll_interval: float = _DEFAULT_POLL_INTERVAL
+        self._poll_interval_min: float = _DEFAULT_POLL_INTERVAL_MIN
+        self._poll_interval_max: float = _DEFAULT_POLL_INTERVAL_MAX
+        self._poll_interval_idle: float = _DEFAULT_POLL_INTERVAL_IDLE
+        self._idle_after: int = _DEFAULT_IDLE_AFTER
+        self._history_path: str = _DEFAULT_HISTORY_PATH
+        self._history_capacity: int = _DEFAULT_HISTORY_CAPACITY
+        self._history_flush_interval: float = _DEFAULT_HISTORY_FLUSH_INTERVAL
+        self._history_retention: float = _DEFAULT_HISTORY_RETENTION
+        self._push_enabled: bool = False
+        self._push_host: str = _DEFAULT_PUSH_HOST
+        self._push_port: int = _DEFAULT_PUSH_PORT
+        self._push_secret: str | None = None
+        self._push_consistency_interval: float = _DEFAULT_PUSH_CONSISTENCY_INTERVAL
         self._main_role: int = int()
         self._allowed_roles: list[int] = list()
         self._load()
 
     def _load(self):
         cfg = config.load_module("round_status")
-        self._host = cfg.get("host")
-        self._port = cfg.get("port")
-        self._channel = cfg.get("channel")
+        servers = cfg.get("servers")
+        if servers is None:
+            # Single-server layout used before the servers list was introduced.
+            servers = [{
+                "name": _DEFAULT_SERVER_NAME,
+                "host": cfg.get("host"),
+                "port": cfg.get("port"),
+                "channel": cfg.get("channel"),
+            }]
+        self._servers = [RoundStatusServer.from_dict(server) for server in servers]
+        self._max_concurrency = cfg.get("max_concurrency") or _DEFAULT_MAX_CONCURRENCY
+        self._poll_interval = cfg.get("poll_interval") or _DEFAULT_POLL_INTERVAL
+        self._poll_interval_min = cfg.get("poll_interval_min") or _DEFAULT_POLL_INTERVAL_MIN
+        self._poll_interval_max = cfg.get("poll_interval_max") or _DEFAULT_POLL_INTERVAL_MAX
+        self._poll_interval_idle = cfg.get("poll_interval_idle") or _DEFAULT_POLL_INTERVAL_IDLE
+        self._idle_after = cfg.get("idle_after") or _DEFAULT_IDLE_AFTER
+        self._history_path = cfg.get("history_path") or _DEFAULT_HISTORY_PATH
+        self._history_capacity = cfg.get("history_capacity") or _DEFAULT_HISTORY_CAPACITY
+        self._history_flush_interval = (cfg.get("history_flush_interval")
+                                        or _DEFAULT_HISTORY_FLUSH_INTERVAL)
+        history_retention = cfg.get("history_retention")
+        self._history_retention = (_DEFAULT_HISTORY_RETENTION if history_retention is None
+                                   else history_retention)
+        self._push_enabled = bool(cfg.get("push_enabled"))
+        self._push_host = cfg.get("push_host") or _DEFAULT_PUSH_HOST
+        self._push_port = cfg.get("push_port") or _DEFAULT_PUSH_PORT
+        self._push_secret = cfg.get("push_secret")
+        self._push_consistency_interval = (cfg.get("push_consistency_interval")
+                                           or _DEFAULT_PUSH_CONSISTENCY_INTERVAL)
         self._main_role = cfg.get("main_role")
-        self._allowed_roles = cfg.get("allowed_roles")
+        self._allowed_roles = cfg.get("allowed_roles") or []
 
-    def _save(self):
-        config.save_module("round_status", {
-            "host": self._host,
-            "port": self._port,
-            "channel": self._channel,
+    def _dump(self) -> dict:
+        return {
+            "servers": [server.to_dict() for server in self._servers],
+            "max_concurrency": self._max_concurrency,
+            "poll_interval": self._poll_interval,
+            "poll_interval_min": self._poll_interval_min,
+            "poll_interval_max": self._poll_interval_max,
+            "poll_interval_idle": self._poll_interval_idle,
+            "idle_after": self._idle_after,
+            "history_path": self._history_path,
+            "history_capacity": self._history_capacity,
+            "history_flush_interval": self._history_flush_interval,
+            "history_retention": self._history_retention,
+            "push_enabled": self._push_enabled,
+            "push_host": self._push_host,
+            "push_port": self._push_port,
+            "push_secret": self._push_secret,
+            "push_consistency_interval": self._push_consistency_interval,
             "main_role": self._main_role,
             "allowed_roles": self._allowed_roles
-        })
+        }
+
+    def _save(self):
+        config.save_module("round_status", self._dump())
 
     async def _async_save(self):
-        await config.async_save_module("round_status", {
-            "host": self._host,
-            "port": self._port,
-            "channel": self._channel,
-            "main_role": self._main_role,
-            "allowed_roles": self._allowed_roles
-        })
+        await config.async_save_module("round_status", self._dump())
+
+    @property
+    def servers(self) -> list[RoundStatusServer]:
+        return self._servers
+
+    @property
+    def max_concurrency(self) -> int:
+        return self._max_concurrency
+
+    @property
+    def poll_interval(self) -> float:
+        return self._poll_interval
+
+    @property
+    def poll_interval_min(self) -> float:
+        return self._poll_interval_min
+
+    @property
+    def poll_interval_max(self) -> float:
+        return self._poll_interval_max
+
+    @property
+    def poll_interval_idle(self) -> float:
+        return self._poll_interval_idle
+
+    @property
+    def idle_after(self) -> int:
+        return self._idle_after
+
+    @property
+    def history_path(self) -> str:
+        return self._history_path
+
+    @property
+    def history_capacity(self) -> int:
+        return self._history_capacity
+
+    @property
+    def history_flush_interval(self) -> float:
+        return self._history_flush_interval
+
+    @property
+    def history_retention(self) -> float:
+        return self._history_retention
+
+    @property
+    def push_enabled(self) -> bool:
+        return self._push_enabled
+
+    @property
+    def push_host(self) -> str:
+        return self._push_host
+
+    @property
+    def push_port(self) -> int:
+        return self._push_port
+
+    @property
+    def push_secret(self) -> str | None:
+        return self._push_secret
+
+    @property
+    def push_consistency_interval(self) -> float:
+        return self._push_consistency_interval
 
     @property
     def host(self) -> str:
-        return self._host
+        return self._servers[0].host if self._servers else None
 
     @property
     def port(self) -> int:
-        return self._port
+        return self._servers[0].port if self._servers else None
 
     @property
     def channel(self) -> int:
-        return self._channel
+        return self._servers[0].channel if self._servers else None
 
     @property
     def main_role(self) -> int:
@@ -56,12 +234,36 @@ class RoundStatusConfig:
     def allowed_roles(self) -> list[int]:
         return self._allowed_roles
 
-    async def async_set_host(self, value: str):
-        self._host = value
+    def get_server(self, name: str | None = None) -> RoundStatusServer | None:
+        if name is None:
+            return self._servers[0] if self._servers else None
+        return next((server for server in self._servers if server.name == name), None)
+
+    async def async_set_host(self, value: str, name: str | None = None):
+        server = self.get_server(name)
+        if server is None:
+            raise KeyError(name)
+        server._host = value
+        await self._async_save()
+
+    async def async_set_port(self, value: int, name: str | None = None):
+        server = self.get_server(name)
+        if server is None:
+            raise KeyError(name)
+        server._port = value
+        await self._async_save()
+
+    async def async_add_server(self, server: RoundStatusServer):
+        if self.get_server(server.name) is not None:
+            raise KeyError(server.name)
+        self._servers.append(server)
         await self._async_save()
 
-    async def async_set_port(self, value: int):
-        self._port = value
+    async def async_remove_server(self, name: str):
+        server = self.get_server(name)
+        if server is None:
+            raise KeyError(name)
+        self._servers.remove(server)
         await self._async_save()
 
     async def async_add_role(self, value: int):
@@ -1,28 +1,34 @@
 from configs import config
 
 
+_DEFAULT_COMPACT_INTERVAL = 30
+
+
 class WhitelistConfig:
     def __init__(self):
         self._main_role: int = int()
         self._allowed_roles: list[int] = list()
+        self._compact_interval: float = _DEFAULT_COMPACT_INTERVAL
         self._load()
 
     def _load(self):
         data = config.load_module("whitelist")
         self._main_role = data.get("main_role", 0)
         self._allowed_roles = data.get("allowed_roles", [])
+        self._compact_interval = data.get("compact_interval") or _DEFAULT_COMPACT_INTERVAL
 
-    def _save(self):
-        config.save_module("whitelist", {
+    def _dump(self) -> dict:
+        return {
             "main_role": self._main_role,
-            "allowed_roles": self._allowed_roles
-        })
+            "allowed_roles": self._allowed_roles,
+            "compact_interval": self._compact_interval
+        }
+
+    def _save(self):
+        config.save_module("whitelist", self._dump())
 
     async def _async_save(self):
-        await config.async_save_module("whitelist", {
-            "main_role": self._main_role,
-            "allowed_roles": self._allowed_roles
-        })
+        await config.async_save_module("whitelist", self._dump())
 
     @property
     def main_role(self) -> int:
@@ -32,6 +38,10 @@ class WhitelistConfig:
     def allowed_roles(self) -> list[int]:
         return self._allowed_roles
 
+    @property
+    def compact_interval(self) -> float:
+        return self._compact_interval
+
     def add_role(self, role: int):
         self._allowed_roles.append(role)
         self._save()
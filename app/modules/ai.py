@@ -1,18 +1,65 @@
-from discord.ext import commands
-from openai import OpenAI, AsyncOpenAI
+from discord.ext import commands, tasks
+from openai import AsyncOpenAI
 from openai.types.beta.assistant import Assistant
 from openai.types.beta.thread import Thread
+from openai.types.beta.threads.run import Run
 from configs.modules import AIConfig
+from typing import AsyncIterator
+from .plugins.prompt_preflight import PromptStats, PromptTooLong, load_encoding, preflight
+from .plugins.rate_limiter import RateLimiter
+from .plugins.reply_sender import ReplySender
+from .plugins.reply_splitter import split_message
+from .plugins.response_cache import ResponseCache, normalize_prompt
+from .plugins.thread_registry import ThreadRegistry
+from .plugins.worker_pool import Job, WorkerPool
 
 import enum
 import discord
 import asyncio
+import aiofiles
+import io
 import loggers
+import os
+import time
 import uuid
+import yaml
 
 logger = loggers.setup_logger("ai")
 ai_config = AIConfig()
 
+DISCORD_MESSAGE_LIMIT = 2000
+SORRY_MESSAGE = "Простите, но я не могу ответить на ваш вопрос. Попробуйте позже"
+LONG_REPLY_NOTICE = "Ответ получился длинным, поэтому он во вложении."
+SUMMARY_REQUEST = ("Кратко перескажи нашу беседу: ключевые факты, имена и договорённости. "
+                   "Не больше десяти предложений.")
+SUMMARY_PREFIX = "Краткое содержание предыдущей беседы:\n"
+
+_GLOBAL_BUCKET = "global"
+
+
+async def load_rate_limits() -> dict:
+    if not os.path.isfile(ai_config.rate_limit_path):
+        return {}
+    async with aiofiles.open(ai_config.rate_limit_path, "r") as file:
+        return yaml.safe_load(await file.read()) or {}
+
+
+async def save_rate_limits(buckets: dict) -> None:
+    async with aiofiles.open(ai_config.rate_limit_path, "w") as file:
+        await file.write(yaml.dump(buckets))
+
+
+async def load_threads() -> dict:
+    if not os.path.isfile(ai_config.threads_path):
+        return {}
+    async with aiofiles.open(ai_config.threads_path, "r") as file:
+        return yaml.safe_load(await file.read()) or {}
+
+
+async def save_threads(threads: dict) -> None:
+    async with aiofiles.open(ai_config.threads_path, "w") as file:
+        await file.write(yaml.dump(threads))
+
 
 def check_roles(ctx: commands.Context):
     if any(role.id == ai_config.main_role for role in ctx.author.roles):
@@ -32,69 +79,312 @@ def check_main_role(ctx: commands.Context):
         f"User '{ctx.author.display_name}' don't have access to the 'AI' module.")
 
 
+class RunFailed(Exception):
+    """The assistant run ended without a complete reply."""
+
+
+class ThreadUsage:
+    __slots__ = ("messages", "tokens")
+
+    def __init__(self) -> None:
+        self.messages = 0
+        self.tokens = 0  # tokens used by the latest run, which grows with the thread
+
+    def is_exhausted(self) -> bool:
+        return ((0 < ai_config.thread_max_messages <= self.messages)
+                or (0 < ai_config.thread_max_tokens <= self.tokens))
+
+
 class OpenAIHandler:
+    __WARM_UP_RETRY_MIN = 5
+    __WARM_UP_RETRY_MAX = 300
+    __HOUSEKEEPING_INTERVAL = 60
+
     def __init__(self) -> None:
-        self.__async_client: AsyncOpenAI = self._create_async_client()  # Use when prompting
-        self.__sync_client: OpenAI = self._create_sync_client()  # Use when initialization
-        self.__assistant: Assistant = self._get_assistant()
-        self.__thread: Thread = self._get_thread()  # OpenAI thread
+        self.__async_client: AsyncOpenAI = self._create_async_client()
+        self.__assistant: Assistant | None = None
+        self.__thread: Thread | None = None  # OpenAI thread shared by everyone
+        # Per-channel or per-user threads, see ai_config.thread_scope.
+        self.__threads = ThreadRegistry(ai_config.thread_cache_size, ai_config.thread_idle_timeout)
+        self.__threads_changed = False
+        self.__pending_threads: dict[str, asyncio.Task] = {}
+        # OpenAI allows only one active run per thread.
+        self.__thread_locks: dict[str, asyncio.Lock] = {}
+        self.__ready = asyncio.Event()
+        self.__warm_up_task: asyncio.Task | None = None
+        self.__housekeeping_task: asyncio.Task | None = None
+        self.__usage: dict[str, ThreadUsage] = {}
+        self.__rotation_tasks: dict[str | None, asyncio.Task] = {}
+        self.__background_tasks: set[asyncio.Task] = set()
 
     def _create_async_client(self) -> AsyncOpenAI:
         return AsyncOpenAI(
             api_key=ai_config.api_key,
             project=ai_config.project_id,
             organization=ai_config.org_id,
+            base_url=ai_config.base_url,
         )
 
-    def _create_sync_client(self) -> OpenAI:
-        return OpenAI(
-            api_key=ai_config.api_key,
-            project=ai_config.project_id,
-            organization=ai_config.org_id,
-        )
-
-    def _get_assistant(self) -> Assistant:
-        return self.__sync_client.beta.assistants.retrieve(assistant_id=ai_config.assistant_id)
+    async def _get_assistant(self) -> Assistant:
+        return await self.__async_client.beta.assistants.retrieve(assistant_id=ai_config.assistant_id)
 
-    def _get_thread(self) -> Thread:
+    async def _get_thread(self) -> Thread:
         if ai_config.thread_id:
-            return self.__sync_client.beta.threads.retrieve(thread_id=ai_config.thread_id)
+            return await self.__async_client.beta.threads.retrieve(thread_id=ai_config.thread_id)
 
         # if thread_id is not provided, create a new thread and save it to the config file
-        thread = self.__sync_client.beta.threads.create()
-        ai_config.thread_id = thread.id
+        thread = await self.__async_client.beta.threads.create()
+        await ai_config.async_set_thread_id(thread.id)
+        return thread
+
+    def start(self) -> None:
+        """Warm up in the background; requests wait in the queue until it is done."""
+        if self.__warm_up_task is None:
+            self.__warm_up_task = asyncio.create_task(self._warm_up())
+
+    async def close(self) -> None:
+        tasks = [self.__warm_up_task, self.__housekeeping_task,
+                 *self.__rotation_tasks.values(), *self.__pending_threads.values(),
+                 *self.__background_tasks]
+        for task in tasks:
+            if task is not None and not task.done():
+                task.cancel()
+        await self._save_threads()
+        await self.__async_client.close()
+
+    async def _warm_up(self) -> None:
+        delay = OpenAIHandler.__WARM_UP_RETRY_MIN
+        while True:
+            try:
+                self.__assistant = await self._get_assistant()
+                self.__thread = await self._get_thread()
+                break
+            except Exception as ex:
+                logger.error(f"OpenAI warm-up failed, retrying in {delay}s => {ex}")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, OpenAIHandler.__WARM_UP_RETRY_MAX)
+        try:
+            for thread_id in self.__threads.load(await load_threads()):
+                self._delete_thread_later(thread_id)
+        except (OSError, yaml.YAMLError, TypeError, ValueError) as ex:
+            logger.warning(f"Could not load saved conversation threads: {ex}")
+        self.__ready.set()
+        self.__housekeeping_task = asyncio.create_task(self._housekeeping())
+        logger.info(f"OpenAI handler is ready. Assistant: {self.__assistant.name}, "
+                    f"thread: {self.__thread.id}, conversation threads: {len(self.__threads)}")
+
+    async def _housekeeping(self) -> None:
+        while True:
+            await asyncio.sleep(OpenAIHandler.__HOUSEKEEPING_INTERVAL)
+            evicted = self.__threads.evict_idle()
+            if evicted:
+                logger.info(f"Dropping {len(evicted)} idle conversation threads.")
+                self.__threads_changed = True
+            for thread_id in evicted:
+                self._delete_thread_later(thread_id)
+            await self._save_threads()
+
+    async def _save_threads(self) -> None:
+        if not self.__threads_changed:
+            return
+        self.__threads_changed = False
+        try:
+            await save_threads(self.__threads.dump())
+        except OSError as ex:
+            logger.error(f"Could not save conversation threads: {ex}")
+
+    @property
+    def is_ready(self) -> bool:
+        return self.__ready.is_set()
+
+    async def wait_ready(self) -> None:
+        await self.__ready.wait()
 
     def _get_formatted_response(self, user_name: str, promt_message: str) -> str:
         return f"{user_name}:\"{promt_message}\""
 
-    async def get_reponse_message(self, user_name: str, promt_message: str):
+    def _get_thread_lock(self, thread_id: str) -> asyncio.Lock:
+        lock = self.__thread_locks.get(thread_id)
+        if lock is None:
+            lock = self.__thread_locks[thread_id] = asyncio.Lock()
+        return lock
+
+    def _current_thread_id(self, thread_key: str | None) -> str | None:
+        return self.__thread.id if thread_key is None else self.__threads.peek(thread_key)
+
+    async def _resolve_thread(self, thread_key: str | None) -> str:
+        if thread_key is None:
+            return self.__thread.id
+        thread_id = self.__threads.get(thread_key)
+        if thread_id is not None:
+            return thread_id
+        # Requests arriving together for a new key share a single thread creation.
+        task = self.__pending_threads.get(thread_key)
+        if task is None:
+            task = asyncio.create_task(self._create_thread(thread_key))
+            self.__pending_threads[thread_key] = task
+            task.add_done_callback(lambda _: self.__pending_threads.pop(thread_key, None))
+        return await asyncio.shield(task)
+
+    async def _create_thread(self, thread_key: str, messages: list[dict] | None = None) -> str:
+        thread = await self.__async_client.beta.threads.create(messages=messages or [])
+        for thread_id in self.__threads.put(thread_key, thread.id):
+            self._delete_thread_later(thread_id)
+        self.__threads_changed = True
+        logger.info(f"Started thread {thread.id} for {thread_key}")
+        return thread.id
+
+    @staticmethod
+    def _get_reply_text(messages) -> str | None:
+        return next(
+            (content.text.value
+             for message in messages.data if message.role == "assistant"
+             for content in message.content if content.type == "text"),
+            None)
+
+    def _record_run(self, thread_key: str | None, thread_id: str, run: Run) -> None:
+        usage = self.__usage.setdefault(thread_id, ThreadUsage())
+        usage.messages += 2  # the prompt and the reply
+        if run.usage is not None:
+            usage.tokens = run.usage.total_tokens
+        if (usage.is_exhausted() and thread_id == self._current_thread_id(thread_key)
+                and thread_key not in self.__rotation_tasks):
+            logger.info(f"Thread {thread_id} reached {usage.messages} messages and "
+                        f"{usage.tokens} tokens, rotating it.")
+            self.__rotation_tasks[thread_key] = asyncio.create_task(
+                self._rotate_thread(thread_key, thread_id))
+
+    async def _rotate_thread(self, thread_key: str | None, old_thread_id: str) -> None:
+        try:
+            summary = await self._summarize(old_thread_id) if ai_config.thread_summary else None
+            messages = [{"role": "assistant", "content": SUMMARY_PREFIX + summary}] if summary else []
+            if thread_key is None:
+                self.__thread = await self.__async_client.beta.threads.create(messages=messages)
+                await ai_config.async_set_thread_id(self.__thread.id)
+                new_thread_id = self.__thread.id
+            else:
+                new_thread_id = await self._create_thread(thread_key, messages)
+        except Exception as ex:
+            logger.error(f"Could not rotate thread {old_thread_id} => {ex}")
+            return
+        finally:
+            self.__rotation_tasks.pop(thread_key, None)
+        logger.info(f"Rotated thread {old_thread_id} => {new_thread_id}")
+        self._delete_thread_later(old_thread_id)
+
+    async def _summarize(self, thread_id: str) -> str | None:
+        async with self._get_thread_lock(thread_id):
+            await self.__async_client.beta.threads.messages.create(
+                thread_id=thread_id,
+                role="user",
+                content=SUMMARY_REQUEST
+            )
+            run = await self.__async_client.beta.threads.runs.create_and_poll(
+                thread_id=thread_id,
+                assistant_id=self.__assistant.id,
+                timeout=30
+            )
+            if run.status != "completed":
+                logger.warning(f"Summary run {run.id} finished with status '{run.status}'")
+                return None
+            messages = await self.__async_client.beta.threads.messages.list(
+                thread_id=thread_id,
+                run_id=run.id,
+                order="desc",
+                limit=1
+            )
+        return self._get_reply_text(messages)
+
+    def _delete_thread_later(self, thread_id: str) -> None:
+        task = asyncio.create_task(self._delete_thread(thread_id))
+        self.__background_tasks.add(task)
+        task.add_done_callback(self.__background_tasks.discard)
+
+    async def _delete_thread(self, thread_id: str) -> None:
+        # Runs already waiting for the old thread finish before it goes away.
+        try:
+            async with self._get_thread_lock(thread_id):
+                await self.__async_client.beta.threads.delete(thread_id=thread_id)
+        except Exception as ex:
+            logger.warning(f"Could not delete thread {thread_id} => {ex}")
+        finally:
+            self.__thread_locks.pop(thread_id, None)
+            self.__usage.pop(thread_id, None)
+
+    async def get_reponse_message(self, user_name: str, promt_message: str,
+                                  thread_key: str | None = None):
         promt_message = self._get_formatted_response(user_name, promt_message)
-        await self.__async_client.beta.threads.messages.create(
-            thread_id=self.__thread.id,
-            role="user",
-            content=promt_message
-        )
-
-        await self.__async_client.beta.threads.runs.create_and_poll(
-            thread_id=self.__thread.id,
-            assistant_id=self.__assistant.id,
-            timeout=15
-        )
-
-        messages = await self.__async_client.beta.threads.messages.list(
-            thread_id=self.__thread.id
-        )
-
-        response_message = messages.data[0].content[0].text.value
-        if response_message == promt_message:
-            return "Простите, но я не могу ответить на ваш вопрос. Попробуйте позже"
+        thread_id = await self._resolve_thread(thread_key)
+        async with self._get_thread_lock(thread_id):
+            await self.__async_client.beta.threads.messages.create(
+                thread_id=thread_id,
+                role="user",
+                content=promt_message
+            )
+
+            run = await self.__async_client.beta.threads.runs.create_and_poll(
+                thread_id=thread_id,
+                assistant_id=self.__assistant.id,
+                timeout=15
+            )
+            if run.status != "completed":
+                raise RunFailed(f"Run {run.id} finished with status '{run.status}'")
+            self._record_run(thread_key, thread_id, run)
+
+            # Only the reply produced by this run is needed, not the thread history.
+            messages = await self.__async_client.beta.threads.messages.list(
+                thread_id=thread_id,
+                run_id=run.id,
+                order="desc",
+                limit=1
+            )
+
+        response_message = self._get_reply_text(messages)
+        if not response_message:
+            raise RunFailed(f"Run {run.id} completed without an assistant reply")
 
         return response_message
 
-    async def new_thread(self):
-        await self.__async_client.beta.threads.delete(thread_id=self.__thread.id)
-        self.__thread = await self.__async_client.beta.threads.create()
-        await ai_config.async_set_thread_id(self.__thread.id)
+    async def stream_response_message(self, user_name: str, promt_message: str,
+                                      thread_key: str | None = None) -> AsyncIterator[str]:
+        """Run the assistant with streaming and yield the reply text accumulated so far."""
+        promt_message = self._get_formatted_response(user_name, promt_message)
+        thread_id = await self._resolve_thread(thread_key)
+        async with self._get_thread_lock(thread_id):
+            await self.__async_client.beta.threads.messages.create(
+                thread_id=thread_id,
+                role="user",
+                content=promt_message
+            )
+
+            text = ""
+            async with self.__async_client.beta.threads.runs.stream(
+                thread_id=thread_id,
+                assistant_id=self.__assistant.id,
+            ) as stream:
+                async for delta in stream.text_deltas:
+                    text += delta
+                    yield text
+                run = await stream.get_final_run()
+                if run.status != "completed":
+                    raise RunFailed(f"Run {run.id} finished with status '{run.status}'")
+                self._record_run(thread_key, thread_id, run)
+
+    async def new_thread(self, thread_key: str | None = None):
+        if thread_key is not None:
+            # The next request for this key starts a fresh thread.
+            old_thread_id = self.__threads.pop(thread_key)
+            if old_thread_id is not None:
+                self.__threads_changed = True
+                self._delete_thread_later(old_thread_id)
+            return
+        old_thread_id = self.__thread.id
+        async with self._get_thread_lock(old_thread_id):
+            await self.__async_client.beta.threads.delete(thread_id=old_thread_id)
+            self.__thread = await self.__async_client.beta.threads.create()
+            await ai_config.async_set_thread_id(self.__thread.id)
+        self.__thread_locks.pop(old_thread_id, None)
+        self.__usage.pop(old_thread_id, None)
 
     @property
     def assistant_name(self) -> str:
@@ -108,17 +398,38 @@ class OpenAIHandler:
     def thread_id(self) -> str:
         return self.__thread.id
 
+    @property
+    def thread_usage(self) -> ThreadUsage:
+        return self.__usage.get(self.__thread.id) or ThreadUsage()
+
+    @property
+    def thread_count(self) -> int:
+        return len(self.__threads)
+
 
 class Status(enum.Enum):
     OFF = "Дремлет"
     READY = "Плетёт интриги"
 
 
+def get_thread_key(ctx: commands.Context) -> str | None:
+    if ai_config.thread_scope == "channel":
+        return f"channel:{ctx.channel.id}"
+    if ai_config.thread_scope == "user":
+        return f"user:{ctx.author.id}"
+    return None
+
+
 class Request:
     def __init__(self, uuid_str: str, ctx: commands.Context, prompt_message: str) -> None:
         self.__uuid_str = uuid_str
         self.__ctx = ctx
         self.__prompt_message = prompt_message
+        self.__thread_key = get_thread_key(ctx)
+        # Identical prompts are only shared within the same conversation.
+        self.__key = (self.__thread_key, normalize_prompt(prompt_message))
+        # Identical prompts that arrived while this one was queued or running.
+        self.__followers: list[commands.Context] = []
 
     @property
     def uuid_str(self) -> str:
@@ -132,17 +443,102 @@ class Request:
     def prompt_message(self) -> str:
         return self.__prompt_message
 
+    @property
+    def thread_key(self) -> str | None:
+        return self.__thread_key
+
+    @property
+    def key(self) -> tuple[str | None, str]:
+        return self.__key
+
+    @property
+    def followers(self) -> list[commands.Context]:
+        return self.__followers
+
+    def add_follower(self, ctx: commands.Context) -> None:
+        self.__followers.append(ctx)
+
 
 class Ai(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.__bot = bot
         self.__ai_handler = OpenAIHandler()
         self.__is_switched_on = False
-        self.__is_active = False
-        self.__queue: asyncio.Queue[Request] = asyncio.Queue()
-        self.__max_requests = 10
-        self.__current_requests = 0
-        self.__lock = asyncio.Lock()
+        self.__pool: WorkerPool[Request] = WorkerPool(
+            self._handle_request, ai_config.workers, on_expired=self._expire_request)
+        # Queued requests by the id of the message that asked them, for cancellation.
+        self.__jobs: dict[int, Job[Request]] = {}
+        self.__limiter = RateLimiter(ai_config.rate_period)
+        self.__limits_changed = False
+        self.__status: Status | None = None
+        self.__in_flight: dict[tuple[str | None, str], Request] = {}
+        self.__coalesced = 0
+        self.__prompt_stats = PromptStats()
+        self.__sender: ReplySender[discord.Message] = ReplySender(ai_config.reply_interval)
+        self.__cache: ResponseCache | None = None
+        if ai_config.cache_enabled:
+            self.__cache = ResponseCache(ai_config.cache_size, ai_config.cache_ttl)
+
+    async def cog_load(self):
+        try:
+            self.__limiter.load(await load_rate_limits())
+        except (OSError, yaml.YAMLError, TypeError, ValueError) as ex:
+            logger.warning(f"Could not load saved request budgets: {ex}")
+        # tiktoken may have to fetch its encoding file, which must not block the loop.
+        if await asyncio.to_thread(load_encoding):
+            logger.info("Prompt tokens are counted with tiktoken.")
+        else:
+            logger.info("Prompt tokens are estimated, tiktoken is not available.")
+        self.__ai_handler.start()
+        self.__pool.start()
+        self.__limits_loop.start()
+
+    async def cog_unload(self):
+        self.__limits_loop.cancel()
+        await self.__pool.stop()
+        await self.__sender.close()
+        await self.__save_limits()
+        await self.__ai_handler.close()
+
+    @tasks.loop(seconds=60)
+    async def __limits_loop(self):
+        await self.__save_limits()
+        # The shared budget refills over time, so wake up again once it has.
+        if self.__is_switched_on and self.__status == Status.OFF and self._has_quota():
+            await self._change_status(Status.READY)
+
+    async def __save_limits(self):
+        if not self.__limits_changed:
+            return
+        self.__limits_changed = False
+        try:
+            await save_rate_limits(self.__limiter.dump())
+        except OSError as ex:
+            logger.error(f"Could not save request budgets: {ex}")
+
+    def _has_quota(self) -> bool:
+        return self.__limiter.available(_GLOBAL_BUCKET, ai_config.max_requests) >= 1
+
+    @staticmethod
+    def _is_privileged(member: discord.Member) -> bool:
+        role_ids = [role.id for role in getattr(member, "roles", [])]
+        return ai_config.main_role in role_ids or any(role in ai_config.allowed_roles for role in role_ids)
+
+    @staticmethod
+    def _user_budget(member: discord.Member) -> int:
+        if Ai._is_privileged(member):
+            return ai_config.privileged_requests
+        role_ids = [role.id for role in getattr(member, "roles", [])]
+        budgets = [ai_config.role_requests[role] for role in role_ids if role in ai_config.role_requests]
+        return max(budgets, default=ai_config.user_requests)
+
+    def _acquire(self, ctx: commands.Context) -> bool:
+        user_bucket = f"user:{ctx.author.id}"
+        user_budget = self._user_budget(ctx.author)
+        if self.__limiter.acquire((_GLOBAL_BUCKET, ai_config.max_requests), (user_bucket, user_budget)):
+            self.__limits_changed = True
+            return True
+        return False
 
     @commands.command(name="mind")
     async def prompt(self, ctx: commands.Context, *, prompt_message: str = ""):
@@ -153,73 +549,268 @@ class Ai(commands.Cog):
             logger.warning(
                 f"{ctx.author.display_name} tried to use the AI module, but it is turned off.")
             return
-        if self.__current_requests >= self.__max_requests:
+        try:
+            # Mentions and extra whitespace are dropped, oversized prompts never take a worker.
+            prompt_message = preflight(
+                prompt_message, ai_config.prompt_max_tokens, ai_config.prompt_truncate,
+                self.__prompt_stats)
+        except PromptTooLong as ex:
             logger.warning(
-                f"{ctx.author.display_name} tried to use the AI module, "
-                "but the max number of requests is reached.")
+                f"'{ctx.author.display_name}' => prompt rejected: {ex.tokens} tokens "
+                f"over the budget of {ex.budget}.")
             await ctx.reply(
-                "Увы, мои силы иссякли, и мне нужно время на восстановление. "
-                "Скоро я буду готова к новой беседе.")
+                f"Слишком длинный вопрос ({ex.tokens} токенов при лимите {ex.budget}). "
+                "Попробуйте сформулировать короче.")
             return
-
-        self.__current_requests += 1
+        if prompt_message and self.__cache is not None:
+            # Cached replies cost no OpenAI run, so they don't count against the quota.
+            cached = self.__cache.get(prompt_message, get_thread_key(ctx))
+            if cached is not None:
+                logger.info(
+                    f"'{ctx.author.display_name}' => answered from the cache. Prompt: {prompt_message}")
+                await self._deliver(ctx, cached)
+                return
+        if prompt_message:
+            leader = self.__in_flight.get((get_thread_key(ctx), normalize_prompt(prompt_message)))
+            if leader is not None:
+                # The same question is already queued or running: share its answer.
+                leader.add_follower(ctx)
+                self.__coalesced += 1
+                logger.info(
+                    f"[{leader.uuid_str}][{ctx.author.display_name}] "
+                    f"=> joined an identical prompt in flight. Prompt: {prompt_message}")
+                return
         if not prompt_message:
             logger.info(
                 f"'{ctx.author.display_name}' => requested an empty prompt message.")
             async with ctx.typing():
+                await self.__ai_handler.wait_ready()
                 await ctx.reply(
                     f"Привет! я {self.__ai_handler.assistant_name}. Чего бы {ctx.author.display_name} хотел знать?")
                 return
 
+        if not self._acquire(ctx):
+            if not self._has_quota():
+                logger.warning(
+                    f"{ctx.author.display_name} tried to use the AI module, "
+                    "but the max number of requests is reached.")
+                await ctx.reply(
+                    "Увы, мои силы иссякли, и мне нужно время на восстановление. "
+                    "Скоро я буду готова к новой беседе.")
+                return
+            retry_after = self.__limiter.retry_after(
+                f"user:{ctx.author.id}", self._user_budget(ctx.author))
+            logger.warning(
+                f"{ctx.author.display_name} tried to use the AI module, "
+                f"but their request budget is spent for {retry_after:.0f}s.")
+            await ctx.reply(
+                f"Давай немного передохнём. Спроси меня снова через {max(1, round(retry_after / 60))} мин.")
+            return
+
         uuid_str = str(uuid.uuid4())
-        await self.__queue.put(Request(uuid_str, ctx, prompt_message))
+        request = Request(uuid_str, ctx, prompt_message)
+        self.__in_flight[request.key] = request
+        # Privileged roles jump the queue; everyone else is served in order.
+        self.__jobs[ctx.message.id] = await self.__pool.submit(
+            request,
+            priority=0 if self._is_privileged(ctx.author) else 1,
+            timeout=ai_config.queue_deadline or None)
         logger.info(
             f"[{uuid_str}][{ctx.author.display_name}] "
             f"=> added a message to the queue. Prompt: {prompt_message}")
-        await self._process_queue()
 
-    async def _process_queue(self):
-        async with self.__lock:
-            if self.__is_active:
-                return
-            self.__is_active = True
-            while not self.__queue.empty():
-                request = await self.__queue.get()
-                try:
-                    await self._process_request(request)
-                except Exception as ex:
-                    logger.error(
-                        f"[{request.uuid_str}][{request.ctx.author.display_name}] "
-                        f"=> error: {ex}")
-                    await request.ctx.reply(
-                        "Простите, но я не могу ответить на ваш вопрос. "
-                        "Попробуйте позже")
-
-                self.__queue.task_done()
+    def _forget_request(self, request: Request):
+        self.__jobs.pop(request.ctx.message.id, None)
+        if self.__in_flight.get(request.key) is request:
+            del self.__in_flight[request.key]
+
+    async def _expire_request(self, request: Request):
+        self._forget_request(request)
+        logger.warning(
+            f"[{request.uuid_str}][{request.ctx.author.display_name}] "
+            f"=> dropped after waiting longer than {ai_config.queue_deadline}s.")
+        notice = "Простите, сейчас слишком много вопросов. Спросите ещё раз чуть позже."
+        for ctx in [request.ctx, *request.followers]:
+            try:
+                await ctx.reply(notice)
+            except discord.HTTPException as ex:
+                logger.warning(f"[{request.uuid_str}] => could not deliver the drop notice: {ex}")
 
+    @commands.Cog.listener()
+    async def on_message_delete(self, message: discord.Message):
+        job = self.__jobs.get(message.id)
+        if job is None or job.item.followers:
+            # Others are waiting for the same answer, so the request stays.
+            return
+        if self.__pool.cancel(job):
+            self._forget_request(job.item)
+            logger.info(
+                f"[{job.item.uuid_str}][{job.item.ctx.author.display_name}] "
+                f"=> prompt message was deleted, the request is cancelled.")
+
+    async def _handle_request(self, request: Request):
+        self.__jobs.pop(request.ctx.message.id, None)
+        # Requests stay queued while the handler is still warming up.
+        await self.__ai_handler.wait_ready()
+        try:
+            response = await self._process_request(request)
+        except Exception as ex:
+            logger.error(
+                f"[{request.uuid_str}][{request.ctx.author.display_name}] "
+                f"=> error: {ex}")
+            response = SORRY_MESSAGE
+            await self._reply_leader(request, response)
+        finally:
+            self._forget_request(request)
+        # Followers get the answer even when it could not be shown to the asker.
+        await self._reply_followers(request, response)
+
+        if self.__pool.depth == 0 and self.__pool.busy <= 1:
             logger.info(f"Queue is empty.")
-            self.__is_active = False
-            if self.__current_requests >= self.__max_requests:
+            if not self._has_quota():
                 await self._change_status(Status.OFF)
 
-    async def _process_request(self, request: Request):
+    async def _reply_leader(self, request: Request, response: str,
+                            message: discord.Message | None = None, shown: str = ""):
+        try:
+            await self._deliver(request.ctx, response, message, shown)
+        except discord.HTTPException as ex:
+            self._log_leader_failure(request, ex)
+
+    @staticmethod
+    def _log_leader_failure(request: Request, ex: discord.HTTPException):
+        logger.warning(
+            f"[{request.uuid_str}][{request.ctx.author.display_name}] "
+            f"=> could not deliver the response: {ex}")
+
+    async def _reply_followers(self, request: Request, response: str):
+        for ctx in request.followers:
+            try:
+                await self._deliver(ctx, response)
+            except discord.HTTPException as ex:
+                logger.warning(
+                    f"[{request.uuid_str}][{ctx.author.display_name}] "
+                    f"=> could not deliver the shared response: {ex}")
+
+    async def _process_request(self, request: Request) -> str:
         current_prompt_message = request.prompt_message
         logger.info(
             f"[{request.uuid_str}][{request.ctx.author.display_name}] "
             f"=> is handling a message from the queue. "
             f"Prompt: {current_prompt_message}")
-        async with request.ctx.typing():
-            response = await self.__ai_handler.get_reponse_message(
-                request.ctx.author.display_name, current_prompt_message)
-            await request.ctx.reply(response)
+        if ai_config.streaming:
+            response, completed = await self._stream_request(request)
+        else:
+            try:
+                async with request.ctx.typing():
+                    response = await self.__ai_handler.get_reponse_message(
+                        request.ctx.author.display_name, current_prompt_message, request.thread_key)
+                completed = True
+            except RunFailed as ex:
+                logger.warning(
+                    f"[{request.uuid_str}][{request.ctx.author.display_name}] => {ex}")
+                response, completed = SORRY_MESSAGE, False
+            await self._reply_leader(request, response)
+        # Only answers from runs that completed are worth repeating.
+        if self.__cache is not None and completed:
+            self.__cache.put(current_prompt_message, response, request.thread_key)
         logger.info(
             f"[{request.uuid_str}][{request.ctx.author.display_name}] "
             f"=> response: {response}")
+        return response
+
+    async def _stream_request(self, request: Request) -> tuple[str, bool]:
+        """Stream the answer into a reply; returns it and whether the run completed."""
+        stream = self.__ai_handler.stream_response_message(
+            request.ctx.author.display_name, request.prompt_message, request.thread_key)
+        message: discord.Message | None = None
+        response = shown = ""
+        completed = True
+        try:
+            async with request.ctx.typing():
+                async for response in stream:
+                    if response.strip():
+                        shown = self._preview(response)
+                        try:
+                            message = await self._reply(request.ctx, shown)
+                        except discord.HTTPException as ex:
+                            # The run goes on: followers and the cache still need the answer.
+                            self._log_leader_failure(request, ex)
+                        break
+            last_edit = time.monotonic()
+
+            async for response in stream:
+                if message is not None and time.monotonic() - last_edit >= ai_config.stream_edit_interval:
+                    shown = self._preview(response)
+                    try:
+                        await message.edit(content=shown)
+                    except discord.HTTPException as ex:
+                        self._log_leader_failure(request, ex)
+                        message = None
+                    last_edit = time.monotonic()
+        except RunFailed as ex:
+            # What was streamed so far is only part of an answer: replace it.
+            logger.warning(
+                f"[{request.uuid_str}][{request.ctx.author.display_name}] => {ex}")
+            response, completed = SORRY_MESSAGE, False
+        finally:
+            await stream.aclose()
+
+        if not response.strip():
+            response, completed = SORRY_MESSAGE, False
+        await self._reply_leader(request, response, message, shown)
+        return response, completed
+
+    async def _deliver(self, ctx: commands.Context, response: str,
+                       message: discord.Message | None = None, shown: str = ""):
+        """Reply with ``response``, or finish the streamed ``message`` with it.
+
+        Replies over the file threshold go out as an attachment. Otherwise the
+        first chunk is sent right away and the rest is left to the background
+        sender as a reply chain, so the worker can move on to the next request.
+        """
+        if 0 < ai_config.reply_file_threshold < len(response):
+            file = discord.File(io.BytesIO(response.encode("utf8")), filename="reply.md")
+            if message is None:
+                await self._reply(ctx, LONG_REPLY_NOTICE, file=file)
+            else:
+                await message.edit(content=LONG_REPLY_NOTICE, attachments=[file])
+            return
+
+        chunks = split_message(response, DISCORD_MESSAGE_LIMIT) or [SORRY_MESSAGE]
+        if message is None:
+            message = await self._reply(ctx, chunks[0])
+        elif chunks[0] != shown:
+            await message.edit(content=chunks[0])
+        self.__sender.mark_sent(ctx.channel.id)
+        self.__sender.submit(ctx.channel.id, self._reply_part, message, chunks[1:])
+
+    @staticmethod
+    async def _reply(ctx: commands.Context, content: str, **kwargs) -> discord.Message:
+        # A prompt deleted while its answer was on the way (a request kept for
+        # its followers) still gets the answer, as a plain message.
+        reference = ctx.message.to_reference(fail_if_not_exists=False)
+        return await ctx.send(content, reference=reference, **kwargs)
+
+    @staticmethod
+    async def _reply_part(message: discord.Message, part: str) -> discord.Message:
+        return await message.reply(part)
+
+    @staticmethod
+    def _preview(text: str) -> str:
+        if len(text) <= DISCORD_MESSAGE_LIMIT:
+            return text
+        return text[:DISCORD_MESSAGE_LIMIT - 1] + "…"
 
     @commands.command(name="ai_new_thread")
     @commands.check(check_roles)
     async def new_thread(self, ctx: commands.Context):
-        await self.__ai_handler.new_thread()
+        await self.__ai_handler.wait_ready()
+        thread_key = get_thread_key(ctx)
+        await self.__ai_handler.new_thread(thread_key)
+        if self.__cache is not None:
+            # Replies from the old thread no longer match the conversation.
+            self.__cache.discard_scope(thread_key)
         logger.info(
             f"'{ctx.author.display_name}' => created a new thread.")
         await ctx.reply("AI created new thread")
@@ -231,7 +822,7 @@ class Ai(commands.Cog):
         logger.info(
             f"'{ctx.author.display_name}' => turned on the AI module.")
         await ctx.reply("AI switched on")
-        if self.__current_requests < self.__max_requests:
+        if self._has_quota():
             await self._change_status(Status.READY)
 
     @commands.check(check_roles)
@@ -248,8 +839,9 @@ class Ai(commands.Cog):
     async def set_max_requests(self, ctx: commands.Context, max_requests: int):
         if max_requests <= 0:
             raise commands.BadArgument(f"The number of requests must be greater than 1.")
-        self.__current_requests = 0
-        self.__max_requests = max_requests
+        await ai_config.async_set_max_requests(max_requests)
+        self.__limiter.reset(_GLOBAL_BUCKET)
+        self.__limits_changed = True
         logger.info(
             f"'{ctx.author.display_name}' => set the max number of requests to {max_requests}.")
         await self._change_status(Status.READY)
@@ -257,12 +849,68 @@ class Ai(commands.Cog):
 
     @commands.check(check_roles)
     @commands.command(name="ai_reset_requests")
-    async def reset_requests(self, ctx: commands.Context):
-        self.__current_requests = 0
+    async def reset_requests(self, ctx: commands.Context, member: discord.Member | None = None):
+        self.__limits_changed = True
+        if member is not None:
+            self.__limiter.reset(f"user:{member.id}")
+            logger.info(f"'{ctx.author.display_name}' => reset the requests of '{member.display_name}'.")
+            await ctx.reply(f"AI reset request budget of {member.display_name}")
+            return
+        self.__limiter.reset()
         logger.info(f"'{ctx.author.display_name}' => reset the number of requests.")
         await self._change_status(Status.READY)
         await ctx.reply("AI reset request counter")
 
+    @commands.check(check_roles)
+    @commands.command(name="ai_queue")
+    async def queue_status(self, ctx: commands.Context):
+        await ctx.reply(
+            f"OpenAI: {'готов' if self.__ai_handler.is_ready else 'подключается'}\n"
+            f"В очереди: {self.__pool.depth}, "
+            f"дольше всех ждёт: {self.__pool.oldest_wait:.1f} с\n"
+            f"Обрабатывается: {self.__pool.busy}/{self.__pool.size}\n"
+            f"Доступно запросов: "
+            f"{int(self.__limiter.available(_GLOBAL_BUCKET, ai_config.max_requests))}/{ai_config.max_requests}\n"
+            f"Обработано: {self.__pool.processed}, "
+            f"просрочено: {self.__pool.expired}, отменено: {self.__pool.cancelled}, "
+            f"объединено одинаковых: {self.__coalesced}\n"
+            f"Среднее ожидание: {self.__pool.average_wait:.1f} с, "
+            f"максимальное: {self.__pool.max_wait:.1f} с"
+            f"{self._thread_status()}"
+            f"{self._prompt_status()}"
+            f"{self._cache_status()}")
+
+    def _prompt_status(self) -> str:
+        stats = self.__prompt_stats
+        return (f"\nРазмер вопросов: в среднем {stats.average_tokens:.0f}, "
+                f"максимум {stats.max_tokens} токенов; "
+                f"отклонено {stats.rejected}, обрезано {stats.truncated}")
+
+    def _thread_status(self) -> str:
+        if not self.__ai_handler.is_ready:
+            return ""
+        if ai_config.thread_scope != "shared":
+            return f"\nТредов: {self.__ai_handler.thread_count}/{ai_config.thread_cache_size}"
+        usage = self.__ai_handler.thread_usage
+        return f"\nТред: {usage.messages} сообщений, {usage.tokens} токенов в последнем запуске"
+
+    def _cache_status(self) -> str:
+        if self.__cache is None:
+            return ""
+        return (f"\nКэш: {len(self.__cache)}/{self.__cache.capacity}, "
+                f"попаданий {self.__cache.hits}, промахов {self.__cache.misses} "
+                f"({self.__cache.hit_rate:.0%})")
+
+    @commands.check(check_roles)
+    @commands.command(name="ai_cache_clear")
+    async def cache_clear(self, ctx: commands.Context):
+        if self.__cache is None:
+            await ctx.reply("AI cache is disabled")
+            return
+        self.__cache.clear()
+        logger.info(f"'{ctx.author.display_name}' => cleared the response cache.")
+        await ctx.reply("AI cache cleared")
+
     @commands.check(check_main_role)
     @commands.command(name="ai_add_role")
     async def add_role(self, ctx: commands.Context, role: int):
@@ -276,6 +924,7 @@ class Ai(commands.Cog):
         await ctx.reply(f"AI role {role} was removed")
 
     async def _change_status(self, status: Status):
+        self.__status = status
         await self.__bot.change_presence(activity=discord.CustomActivity(name=status.value))
         logger.info(f"Status was changed to {status.value}")
 
@@ -8,21 +8,18 @@ TOPIC_PACKET_ID = b"\x83"
 TOPIC_RESPONSE_STRING = b"\x06"
 TOPIC_RESPONSE_FLOAT = b"\x2a"
 
+# pad byte, packetId, big-endian uint16_t content length, response type
+_RESPONSE_HEADER = struct.Struct(">xcHc")
+_RESPONSE_FLOAT = struct.Struct("<f")
+RESPONSE_HEADER_SIZE = _RESPONSE_HEADER.size
 
-def export(address, port, args):
-    send(address, port, urllib.parse.urlencode(args))
+DEFAULT_CONNECT_TIMEOUT = 5.0
+DEFAULT_READ_TIMEOUT = 5.0
+DEFAULT_MAX_CONCURRENCY = 4
+DEFAULT_MAX_IDLE = 2
 
 
-async def send(address, port, query):
-    """Send a Topic() packet to the specified server. Returns the response from the server.
-    :param address: address (IP or DNS) of the DreamDaemon instance to send the Topic() to.
-    :param port:    port that the DreamDaemon instance is serving the world on
-    :param query:   query string to be sent
-    :returns: a tuple of response type, and dict of key-value pairs, parsed from
-    the url query string returned from the server. The actual data returned
-    depends on the codebase the server is running.
-    """
-    reader, writer = await asyncio.open_connection(address, port)
+def _build_packet(query):
     if len(query) == 0 or query[0] != "?":
         queryString = "?" + query
     else:
@@ -35,62 +32,307 @@ async def send(address, port, query):
     packetSize = len(queryString) + 6
     if packetSize >= (2**16 - 1):
         raise Exception("query string too big, max packet size exceeded.")
-    packet = (
+    return (
         struct.pack(">xcH5x", TOPIC_PACKET_ID, packetSize)
         + bytes(queryString, encoding="utf8")
         + b"\x00"
     )
-    writer.write(packet)
-    await writer.drain()
-    while True:
-        recv_header = await reader.read(5)
-        recvPacketId, content_len, response_type = struct.unpack(">xcHc", recv_header)
-        if recvPacketId != TOPIC_PACKET_ID:
-            # How strange. Are we perhaps talking to something that isn't a BYOND server?
-            writer.close()
-            await writer.wait_closed()
-            raise Exception(
-                "Incorrect packet-ID received in response. Expecting 0x83, received {}".format(
-                    recvPacketId
-                )
+
+
+class TopicPacket:
+    """A single framed Topic() response: its type byte and payload view."""
+
+    __slots__ = ("response_type", "payload")
+
+    def __init__(self, response_type: bytes, payload: memoryview):
+        self.response_type = response_type
+        self.payload = payload
+
+    def decode(self):
+        return decode_payload(self.response_type, self.payload)
+
+
+def _parse_header(header) -> tuple[bytes, int]:
+    recvPacketId, content_len, response_type = _RESPONSE_HEADER.unpack_from(header)
+    if recvPacketId != TOPIC_PACKET_ID:
+        # How strange. Are we perhaps talking to something that isn't a BYOND server?
+        raise Exception(
+            "Incorrect packet-ID received in response. Expecting 0x83, received {}".format(
+                recvPacketId
             )
+        )
+    # content_len counts the response type byte, which is part of the header.
+    return response_type, content_len - 1
+
+
+def _make_packet(response_type: bytes, body) -> TopicPacket:
+    payload = memoryview(body)
+    if response_type == TOPIC_RESPONSE_STRING and payload[-1:] == b"\x00":
+        # Strip the trailing NUL terminator without copying.
+        payload = payload[:-1]
+    return TopicPacket(response_type, payload)
+
+
+def decode_payload(response_type, payload):
+    if response_type == TOPIC_RESPONSE_STRING:
+        return urllib.parse.parse_qs(
+            str(payload, encoding="utf8"), keep_blank_values=True
+        )
+    elif response_type == TOPIC_RESPONSE_FLOAT:
+        # Float type response, where the data returned is a floating point value.
+        return _RESPONSE_FLOAT.unpack_from(payload)[0]
+    else:
+        # No idea what response *this* is, but maybe it's something
+        # specific to a codebase we're not used to.
+        return bytes(payload)
+
+
+async def read_packet(reader: asyncio.StreamReader) -> TopicPacket:
+    """Read exactly one response packet from ``reader``.
+
+    Raises ``asyncio.IncompleteReadError`` if the stream ends mid-packet.
+    """
+    response_type, content_len = _parse_header(
+        await reader.readexactly(RESPONSE_HEADER_SIZE))
+    return _make_packet(response_type, await reader.readexactly(content_len))
+
+
+class RoundStatusSnapshot:
+    """A ``?status`` response, decoded lazily.
+
+    Only the keys that are actually requested are located and unquoted;
+    numeric fields are converted once and cached. The full payload is
+    available through ``raw``/``as_dict`` on demand.
+    """
+
+    __slots__ = ("__payload", "__values", "__raw")
+
+    def __init__(self, payload):
+        self.__payload: bytes = bytes(payload)
+        self.__values: dict = {}
+        self.__raw: str | None = None
+
+    def __find(self, key: str) -> str | None:
+        payload = self.__payload
+        needle = urllib.parse.quote_plus(key).encode() + b"="
+        if payload.startswith(needle):
+            start = len(needle)
         else:
-            if response_type == TOPIC_RESPONSE_STRING:
-                content_len -= 2
-            if response_type == TOPIC_RESPONSE_FLOAT:
-                content_len -= 1
-            response = await reader.read(content_len)
-            if len(response) < content_len:
-                raise Exception(
-                    f"Truncated response: {str(len(response))} of {str(content_len)})"
-                )
-            writer.close()
+            index = payload.find(b"&" + needle)
+            if index == -1:
+                return None
+            start = index + 1 + len(needle)
+        end = payload.find(b"&", start)
+        if end == -1:
+            end = len(payload)
+        return urllib.parse.unquote_plus(payload[start:end].decode("utf8"))
+
+    def get(self, key: str, default: str | None = None) -> str | None:
+        values = self.__values
+        if key not in values:
+            values[key] = self.__find(key)
+        value = values[key]
+        return default if value is None else value
+
+    def get_int(self, key: str, default: int = 0) -> int:
+        values = self.__values
+        cache_key = (key, int)
+        if cache_key not in values:
+            value = self.get(key)
+            try:
+                values[cache_key] = int(float(value)) if value else None
+            except ValueError:
+                values[cache_key] = None
+        value = values[cache_key]
+        return default if value is None else value
+
+    @property
+    def gamestate(self) -> int:
+        return self.get_int("gamestate", -1)
+
+    @property
+    def round_duration(self) -> int:
+        return self.get_int("round_duration")
+
+    @property
+    def players(self) -> int:
+        return self.get_int("players")
+
+    @property
+    def raw(self) -> str:
+        if self.__raw is None:
+            self.__raw = self.__payload.decode("utf8")
+        return self.__raw
+
+    def as_dict(self) -> dict[str, list[str]]:
+        return urllib.parse.parse_qs(self.raw, keep_blank_values=True)
+
+
+class TopicClient:
+    """Topic() client bound to a single DreamDaemon instance.
+
+    Connections are opened lazily, bounded by ``max_concurrency`` and kept
+    for reuse (up to ``max_idle``) as long as the server leaves them open.
+    Every network step is bounded by ``connect_timeout``/``read_timeout``.
+    """
+
+    def __init__(
+        self,
+        address,
+        port,
+        connect_timeout=DEFAULT_CONNECT_TIMEOUT,
+        read_timeout=DEFAULT_READ_TIMEOUT,
+        max_concurrency=DEFAULT_MAX_CONCURRENCY,
+        max_idle=DEFAULT_MAX_IDLE,
+    ):
+        self.address = address
+        self.port = port
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.max_idle = max_idle
+        self.__semaphore = asyncio.Semaphore(max_concurrency)
+        self.__idle: list[tuple[asyncio.StreamReader, asyncio.StreamWriter]] = []
+        self.__closed = False
+
+    async def send(self, query):
+        """Send a Topic() packet to the server. Returns the response from the server.
+        :param query:   query string to be sent
+        :returns: a tuple of response type, and dict of key-value pairs, parsed from
+        the url query string returned from the server. The actual data returned
+        depends on the codebase the server is running.
+        """
+        response = await self.request(query)
+        return (response.response_type, response.decode())
+
+    async def request(self, query) -> TopicPacket:
+        """Send a Topic() packet to the server and return the undecoded response packet."""
+        packet = _build_packet(query)
+        async with self.__semaphore:
+            connection, reused = await self.__acquire()
+            try:
+                response = await self.__exchange(connection, packet)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                await self.__discard(connection)
+                if not reused:
+                    raise
+                # The server dropped a warm connection between requests;
+                # retry once over a fresh one.
+                connection = await self.__connect()
+                try:
+                    response = await self.__exchange(connection, packet)
+                except BaseException:
+                    await self.__discard(connection)
+                    raise
+            except BaseException:
+                await self.__discard(connection)
+                raise
+            await self.__release(connection)
+        return response
+
+    async def query_status(self):
+        response = await self.request("?status")
+        if response.response_type == TOPIC_RESPONSE_STRING:
+            return RoundStatusSnapshot(response.payload)
+        else:
+            return None
+
+    async def query_player_count(self):
+        responseType, responseData = await self.send("?playing")
+        if responseType == TOPIC_RESPONSE_FLOAT:
+            return str(int(responseData))
+        else:
+            return None
+
+    async def close(self):
+        self.__closed = True
+        idle, self.__idle = self.__idle, []
+        for connection in idle:
+            await self.__discard(connection)
+
+    async def __connect(self):
+        return await asyncio.wait_for(
+            asyncio.open_connection(self.address, self.port),
+            timeout=self.connect_timeout,
+        )
+
+    async def __acquire(self):
+        while self.__idle:
+            reader, writer = self.__idle.pop()
+            if reader.at_eof() or writer.is_closing():
+                await self.__discard((reader, writer))
+                continue
+            return (reader, writer), True
+        return await self.__connect(), False
+
+    async def __release(self, connection):
+        reader, writer = connection
+        if (self.__closed or len(self.__idle) >= self.max_idle
+                or reader.at_eof() or writer.is_closing()):
+            await self.__discard(connection)
+        else:
+            self.__idle.append(connection)
+
+    async def __discard(self, connection):
+        writer = connection[1]
+        writer.close()
+        try:
             await writer.wait_closed()
-            if response_type == TOPIC_RESPONSE_STRING:
-                data = urllib.parse.parse_qs(
-                    str(response, encoding="utf8"), keep_blank_values=True
-                )
-            elif response_type == TOPIC_RESPONSE_FLOAT:
-                # Float type response, where the data returned is a floating point value.
-                data = struct.unpack("<f", response)[0]
-            else:
-                # No idea what response *this* is, but maybe it's something
-                # specific to a codebase we're not used to.
-                data = response
-            return (response_type, data)
+        except (ConnectionError, OSError):
+            pass
+
+    async def __exchange(self, connection, packet):
+        reader, writer = connection
+        writer.write(packet)
+        await asyncio.wait_for(writer.drain(), timeout=self.read_timeout)
+        return await asyncio.wait_for(read_packet(reader), timeout=self.read_timeout)
+
+
+_clients: dict[tuple[str, int], TopicClient] = {}
+
+
+def get_client(address, port, **kwargs) -> TopicClient:
+    """Return the shared TopicClient for ``address:port``, creating it on first use."""
+    key = (address, int(port))
+    client = _clients.get(key)
+    if client is None:
+        client = TopicClient(address, port, **kwargs)
+        _clients[key] = client
+    return client
+
+
+async def close_client(address, port):
+    """Close and forget the shared TopicClient for ``address:port``, if there is one."""
+    client = _clients.pop((address, int(port)), None)
+    if client is not None:
+        await client.close()
+
+
+async def close_clients():
+    clients = list(_clients.values())
+    _clients.clear()
+    for client in clients:
+        await client.close()
+
+
+async def export(address, port, args):
+    return await send(address, port, urllib.parse.urlencode(args))
+
+
+async def send(address, port, query):
+    """Send a Topic() packet to the specified server. Returns the response from the server.
+    :param address: address (IP or DNS) of the DreamDaemon instance to send the Topic() to.
+    :param port:    port that the DreamDaemon instance is serving the world on
+    :param query:   query string to be sent
+    :returns: a tuple of response type, and dict of key-value pairs, parsed from
+    the url query string returned from the server. The actual data returned
+    depends on the codebase the server is running.
+    """
+    return await get_client(address, port).send(query)
 
 
 async def queryStatus(address, port):
-    responseType, responseData = await send(address, port, "?status")
-    if responseType == TOPIC_RESPONSE_STRING:
-        return responseData
-    else:
-        return None
+    return await get_client(address, port).query_status()
 
 
 async def queryPlayerCount(address, port):
-    responseType, responseData = await send(address, port, "?playing")
-    if responseType == TOPIC_RESPONSE_FLOAT:
-        return str(int(responseData))
-    else:
-        return None
\ No newline at end of file
+    return await get_client(address, port).query_player_count()
@@ -0,0 +1,65 @@
+import random
+import time
+
+
+class PollScheduler:
+    """Chooses the delay before the next status query of a single server.
+
+    ``failure`` backs off exponentially (with jitter) up to ``max_interval``,
+    ``fast`` polls at ``min_interval`` around round transitions, ``idle``
+    slows down to ``idle_interval``, ``normal`` returns to ``interval`` and
+    ``defer`` waits an arbitrary time (e.g. while pushes keep state fresh).
+    """
+
+    def __init__(self, interval: float, min_interval: float, max_interval: float,
+                 idle_interval: float):
+        self.base_interval = interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.idle_interval = idle_interval
+        self.__failures = 0
+        self.__interval = interval
+        self.__next_poll = 0.0
+
+    @property
+    def interval(self) -> float:
+        return self.__interval
+
+    @property
+    def failures(self) -> int:
+        return self.__failures
+
+    @property
+    def next_poll(self) -> float:
+        return self.__next_poll
+
+    def is_due(self, now: float | None = None) -> bool:
+        return (time.monotonic() if now is None else now) >= self.__next_poll
+
+    def failure(self) -> float:
+        self.__failures += 1
+        ceiling = min(self.max_interval, self.base_interval * 2 ** (self.__failures - 1))
+        return self.__schedule(random.uniform(ceiling / 2, ceiling))
+
+    def fast(self) -> float:
+        self.__failures = 0
+        return self.__schedule(self.min_interval)
+
+    def idle(self) -> float:
+        self.__failures = 0
+        return self.__schedule(self.idle_interval)
+
+    def normal(self) -> float:
+        self.__failures = 0
+        return self.__schedule(self.base_interval)
+
+    def defer(self, interval: float) -> float:
+        self.__failures = 0
+        return self.__schedule(max(self.min_interval, interval), bounded=False)
+
+    def __schedule(self, interval: float, bounded: bool = True) -> float:
+        if bounded:
+            interval = max(self.min_interval, min(self.max_interval, interval))
+        self.__interval = interval
+        self.__next_poll = time.monotonic() + self.__interval
+        return self.__interval
@@ -0,0 +1,119 @@
+import functools
+import re
+
+try:
+    import tiktoken
+except ImportError:  # optional, a local estimate is used instead
+    tiktoken = None
+
+
+_ENCODING = "o200k_base"
+_MENTION_PATTERN = re.compile(r"<@[!&]?\d+>|<#\d+>|@everyone|@here")
+_SPACES_PATTERN = re.compile(r"[^\S\n]+")
+_NEWLINES_PATTERN = re.compile(r"\s*\n\s*\n\s*")
+# Without tiktoken: words in pieces of up to four characters and single
+# punctuation marks, which is close to what BPE does for Russian and English.
+_TOKEN_PATTERN = re.compile(r"\w{1,4}|[^\w\s]")
+
+
+class PromptTooLong(ValueError):
+    def __init__(self, tokens: int, budget: int):
+        super().__init__(f"Prompt has {tokens} tokens, the budget is {budget}")
+        self.tokens = tokens
+        self.budget = budget
+
+
+@functools.cache
+def _get_encoding():
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.get_encoding(_ENCODING)
+    except Exception:  # the encoding file could not be loaded, e.g. offline
+        return None
+
+
+def load_encoding() -> bool:
+    """Load the tokenizer ahead of the first prompt; returns whether tiktoken is used.
+
+    On a cold cache tiktoken downloads the encoding file, so call this off the
+    event loop. Point ``TIKTOKEN_CACHE_DIR`` at a pre-seeded directory to avoid
+    the download entirely.
+    """
+    return _get_encoding() is not None
+
+
+def clean_prompt(text: str) -> str:
+    """Drop mentions and collapse runs of spaces and blank lines."""
+    text = _MENTION_PATTERN.sub("", text)
+    text = _SPACES_PATTERN.sub(" ", text)
+    text = _NEWLINES_PATTERN.sub("\n\n", text)
+    return "\n".join(line.strip() for line in text.strip().split("\n"))
+
+
+@functools.lru_cache(maxsize=1024)
+def count_tokens(text: str) -> int:
+    encoding = _get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text))
+    return len(_TOKEN_PATTERN.findall(text))
+
+
+def truncate_tokens(text: str, budget: int) -> str:
+    encoding = _get_encoding()
+    if encoding is not None:
+        cut = encoding.decode(encoding.encode(text)[:budget])
+    else:
+        end = 0
+        for index, match in enumerate(_TOKEN_PATTERN.finditer(text)):
+            if index == budget:
+                break
+            end = match.end()
+        cut = text[:end]
+    # Don't leave half a word at the end.
+    if len(cut) < len(text) and text[len(cut)].isalnum() and " " in cut:
+        cut = cut.rsplit(" ", 1)[0]
+    return cut.rstrip()
+
+
+class PromptStats:
+    __slots__ = ("prompts", "total_tokens", "max_tokens", "rejected", "truncated")
+
+    def __init__(self):
+        self.prompts = 0
+        self.total_tokens = 0
+        self.max_tokens = 0
+        self.rejected = 0
+        self.truncated = 0
+
+    @property
+    def average_tokens(self) -> float:
+        return self.total_tokens / self.prompts if self.prompts else 0.0
+
+    def record(self, tokens: int):
+        self.prompts += 1
+        self.total_tokens += tokens
+        self.max_tokens = max(self.max_tokens, tokens)
+
+
+def preflight(text: str, budget: int, truncate: bool, stats: PromptStats | None = None) -> str:
+    """Clean a prompt and fit it into ``budget`` tokens (0 - unlimited).
+
+    Raises ``PromptTooLong`` when the prompt is over budget and ``truncate``
+    is off; otherwise the prompt is cut down to the budget.
+    """
+    text = clean_prompt(text)
+    if not text:
+        return text
+    tokens = count_tokens(text)
+    if stats is not None:
+        stats.record(tokens)
+    if not budget or tokens <= budget:
+        return text
+    if not truncate:
+        if stats is not None:
+            stats.rejected += 1
+        raise PromptTooLong(tokens, budget)
+    if stats is not None:
+        stats.truncated += 1
+    return truncate_tokens(text, budget)
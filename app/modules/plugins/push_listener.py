@@ -0,0 +1,75 @@
+import hmac
+import logging
+import urllib.parse
+
+from typing import Awaitable, Callable
+
+from aiohttp import web
+
+from .byond_topic import RoundStatusSnapshot
+
+
+PUSH_PATH = "/roundstatus"
+
+logger = logging.getLogger("roundstatus")
+
+PushHandler = Callable[[str, RoundStatusSnapshot], Awaitable[None]]
+
+
+class PushListener:
+    """Local HTTP endpoint the game server calls on round events.
+
+    Accepts ``GET`` or ``POST`` (form encoded) requests to ``/roundstatus``
+    carrying the same fields as a ``?status`` response plus ``server`` (the
+    configured server name) and ``key`` (the shared secret, which may also
+    be sent as an ``Authorization: Bearer`` header). BYOND's world.Export()
+    can issue such a request directly.
+    """
+
+    def __init__(self, host: str, port: int, secret: str, handler: PushHandler):
+        self.host = host
+        self.port = port
+        self.__secret = secret.encode()
+        self.__handler = handler
+        self.__runner: web.AppRunner | None = None
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_route("GET", PUSH_PATH, self.__handle)
+        app.router.add_route("POST", PUSH_PATH, self.__handle)
+        self.__runner = web.AppRunner(app, access_log=None)
+        await self.__runner.setup()
+        await web.TCPSite(self.__runner, self.host, self.port).start()
+
+    async def stop(self):
+        if self.__runner is not None:
+            await self.__runner.cleanup()
+            self.__runner = None
+
+    def __is_authorized(self, request: web.Request, params) -> bool:
+        key = params.get("key", "")
+        authorization = request.headers.get("Authorization", "")
+        if authorization.startswith("Bearer "):
+            key = authorization[len("Bearer "):]
+        return hmac.compare_digest(key.encode(), self.__secret)
+
+    async def __handle(self, request: web.Request) -> web.Response:
+        if request.method == "POST":
+            params = dict(urllib.parse.parse_qsl(await request.text(), keep_blank_values=True))
+        else:
+            params = dict(request.query)
+
+        if not self.__is_authorized(request, params):
+            logger.warning(f"Rejected push from {request.remote}: bad key")
+            return web.Response(status=403)
+
+        server = params.pop("server", "")
+        params.pop("key", None)
+        snapshot = RoundStatusSnapshot(urllib.parse.urlencode(params).encode())
+        try:
+            await self.__handler(server, snapshot)
+        except KeyError:
+            return web.Response(status=404, text=f"unknown server {server}")
+        except ValueError as ex:
+            return web.Response(status=400, text=str(ex))
+        return web.Response(text="ok")
@@ -0,0 +1,76 @@
+import time
+
+
+class TokenBucket:
+    __slots__ = ("tokens", "updated")
+
+    def __init__(self, tokens: float, updated: float):
+        self.tokens = tokens
+        self.updated = updated
+
+
+class RateLimiter:
+    """Token buckets that refill continuously over ``period`` seconds.
+
+    A bucket with a budget of N requests holds at most N tokens and regains
+    N tokens per ``period``, so a user who spent the budget gets one request
+    back every ``period / N`` seconds. Budgets are passed on each call, which
+    lets the caller pick them per user or role; buckets are created lazily
+    and every check is O(1). Timestamps are wall-clock so the state can be
+    saved and restored across restarts.
+    """
+
+    def __init__(self, period: float):
+        self.period = period
+        self.__buckets: dict[str, TokenBucket] = {}
+
+    def available(self, key: str, budget: int, now: float | None = None) -> float:
+        return self.__refill(key, budget, time.time() if now is None else now).tokens
+
+    def retry_after(self, key: str, budget: int, now: float | None = None) -> float:
+        """Seconds until the bucket holds a whole token again."""
+        tokens = self.available(key, budget, now)
+        if tokens >= 1 or budget <= 0:
+            return 0.0
+        return (1 - tokens) * self.period / budget
+
+    def acquire(self, *limits: tuple[str, int], now: float | None = None) -> bool:
+        """Take one token from every ``(key, budget)`` bucket, or from none of them."""
+        now = time.time() if now is None else now
+        buckets = [self.__refill(key, budget, now) for key, budget in limits]
+        if any(bucket.tokens < 1 for bucket in buckets):
+            return False
+        for bucket in buckets:
+            bucket.tokens -= 1
+        return True
+
+    def reset(self, key: str | None = None):
+        if key is None:
+            self.__buckets.clear()
+        else:
+            self.__buckets.pop(key, None)
+
+    def dump(self, now: float | None = None) -> dict[str, list[float]]:
+        # A bucket untouched for a whole period is full again whatever its budget.
+        now = time.time() if now is None else now
+        return {
+            key: [bucket.tokens, bucket.updated]
+            for key, bucket in self.__buckets.items()
+            if now - bucket.updated < self.period
+        }
+
+    def load(self, data: dict[str, list[float]]):
+        self.__buckets = {
+            str(key): TokenBucket(float(tokens), float(updated))
+            for key, (tokens, updated) in data.items()
+        }
+
+    def __refill(self, key: str, budget: int, now: float) -> TokenBucket:
+        bucket = self.__buckets.get(key)
+        if bucket is None:
+            bucket = self.__buckets[key] = TokenBucket(budget, now)
+            return bucket
+        elapsed = max(0.0, now - bucket.updated)
+        bucket.tokens = min(budget, bucket.tokens + elapsed * budget / self.period)
+        bucket.updated = now
+        return bucket
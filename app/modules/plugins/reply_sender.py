@@ -0,0 +1,93 @@
+import asyncio
+import logging
+import time
+
+from typing import Awaitable, Callable, Generic, Hashable, TypeVar
+
+
+M = TypeVar("M")
+
+logger = logging.getLogger("ai")
+
+
+class _Chain(Generic[M]):
+    __slots__ = ("send", "previous", "parts")
+
+    def __init__(self, send: Callable[[M, str], Awaitable[M]], previous: M, parts: list[str]):
+        self.send = send
+        self.previous = previous
+        self.parts = parts
+
+
+class ReplySender(Generic[M]):
+    """Delivers the tail of long replies in the background.
+
+    Each submitted chain is sent part by part with ``send(previous, part)``,
+    every part answering the one before it. Chains for the same channel go
+    out in order and at least ``interval`` seconds apart, which keeps a bot
+    under Discord's per-channel rate limit instead of relying on 429 retries,
+    while the caller is already free to handle the next request.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.__queues: dict[Hashable, asyncio.Queue[_Chain[M]]] = {}
+        self.__workers: dict[Hashable, asyncio.Task] = {}
+        self.__last_sent: dict[Hashable, float] = {}
+        self.__pending = 0
+
+    @property
+    def pending(self) -> int:
+        """Parts submitted but not sent (or given up on) yet."""
+        return self.__pending
+
+    def mark_sent(self, channel: Hashable):
+        """Note a message sent to ``channel`` outside of the sender."""
+        self.__last_sent[channel] = time.monotonic()
+
+    def submit(self, channel: Hashable, send: Callable[[M, str], Awaitable[M]], previous: M,
+               parts: list[str]):
+        if not parts:
+            return
+        queue = self.__queues.get(channel)
+        if queue is None:
+            queue = self.__queues[channel] = asyncio.Queue()
+        queue.put_nowait(_Chain(send, previous, parts))
+        self.__pending += len(parts)
+        if channel not in self.__workers:
+            self.__workers[channel] = asyncio.create_task(self.__work(channel, queue))
+
+    async def close(self):
+        workers = list(self.__workers.values())
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        self.__workers.clear()
+        self.__queues.clear()
+        self.__pending = 0
+
+    async def __work(self, channel: Hashable, queue: asyncio.Queue[_Chain[M]]):
+        try:
+            while not queue.empty():
+                chain = queue.get_nowait()
+                previous = chain.previous
+                for index, part in enumerate(chain.parts):
+                    delay = self.__last_sent.get(channel, 0.0) + self.interval - time.monotonic()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                    try:
+                        previous = await chain.send(previous, part)
+                    except asyncio.CancelledError:
+                        raise
+                    except Exception as ex:
+                        logger.error(f"Could not deliver a reply part to {channel}: {ex}")
+                        self.__pending -= len(chain.parts) - index
+                        break
+                    finally:
+                        self.__last_sent[channel] = time.monotonic()
+                    self.__pending -= 1
+        finally:
+            # Idle channels keep no task or queue around.
+            self.__workers.pop(channel, None)
+            if queue.empty():
+                self.__queues.pop(channel, None)
@@ -0,0 +1,69 @@
+_FENCE = "```"
+_CLOSE_FENCE = "\n" + _FENCE
+# Room kept on each line piece for a reopened code fence header and its closing.
+_FENCE_RESERVE = 32
+# Longest code fence header carried over to the next chunk, so it still fits in the reserve.
+_FENCE_HEADER_MAX = _FENCE_RESERVE - len(_CLOSE_FENCE) - 1
+
+
+def _pieces(text: str, width: int):
+    """Yield the lines of ``text`` (with their newlines), splitting those wider than ``width`` at spaces."""
+    for line in text.splitlines(keepends=True):
+        while len(line) > width:
+            cut = line.rfind(" ", 0, width)
+            cut = cut + 1 if cut > 0 else width
+            yield line[:cut]
+            line = line[cut:]
+        if line:
+            yield line
+
+
+def split_message(text: str, limit: int = 2000) -> list[str]:
+    """Split ``text`` into chunks of at most ``limit`` characters in one pass.
+
+    Chunks end on a blank line (paragraph break) when one falls in the second
+    half of the chunk and on a line break otherwise. A code block that spans
+    two chunks is closed at the end of the first and reopened, with its
+    language, at the start of the next so both render correctly.
+    """
+    chunks: list[str] = []
+    lines: list[str] = []
+    size = 0
+    fence: str | None = None  # header of the code block the current line is in
+    paragraph: tuple[int, int, str | None] | None = None  # (lines, size, fence) after the last blank line
+
+    def flush(count: int, open_fence: str | None):
+        nonlocal size, paragraph
+        body = "".join(lines[:count]).rstrip()
+        if open_fence is not None:
+            body += _CLOSE_FENCE
+        if body.strip():
+            chunks.append(body)
+        rest = lines[count:]
+        lines.clear()
+        if open_fence is not None:
+            lines.append(open_fence + "\n")
+        lines.extend(rest)
+        size = sum(len(line) for line in lines)
+        paragraph = None
+
+    for line in _pieces(text, max(1, limit - _FENCE_RESERVE)):
+        is_fence = line.lstrip().startswith(_FENCE)
+        reserve = len(_CLOSE_FENCE) if fence is not None or is_fence else 0
+        # A paragraph flush can leave enough behind for the line to still not fit.
+        while lines and size + len(line) + reserve > limit:
+            if paragraph is not None and paragraph[1] >= limit // 2:
+                flush(paragraph[0], paragraph[2])
+            else:
+                flush(len(lines), fence)
+
+        lines.append(line)
+        size += len(line)
+        if is_fence:
+            fence = None if fence is not None else line.strip()[:_FENCE_HEADER_MAX]
+        elif not line.strip():
+            paragraph = (len(lines), size, fence)
+
+    if lines:
+        flush(len(lines), None)
+    return chunks
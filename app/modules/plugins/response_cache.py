@@ -0,0 +1,71 @@
+import time
+
+from collections import OrderedDict
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Fold case and whitespace so trivially different spellings share a key."""
+    return " ".join(prompt.casefold().split())
+
+
+class ResponseCache:
+    """Bounded LRU cache of assistant replies keyed on the normalized prompt.
+
+    Each entry also belongs to a ``scope`` (the conversation it was answered
+    in), so a reply is only served back within the same conversation.
+
+    Entries older than ``ttl`` seconds are treated as missing; when the cache
+    holds ``capacity`` entries the least recently used one is evicted.
+    """
+
+    def __init__(self, capacity: int, ttl: float):
+        self.capacity = max(1, capacity)
+        self.ttl = ttl
+        self.__entries: OrderedDict[tuple[str | None, str], tuple[float, str]] = OrderedDict()
+        self.__hits = 0
+        self.__misses = 0
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    @property
+    def hits(self) -> int:
+        return self.__hits
+
+    @property
+    def misses(self) -> int:
+        return self.__misses
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.__hits + self.__misses
+        return self.__hits / lookups if lookups else 0.0
+
+    def get(self, prompt: str, scope: str | None = None) -> str | None:
+        key = (scope, normalize_prompt(prompt))
+        entry = self.__entries.get(key)
+        if entry is None or time.monotonic() - entry[0] > self.ttl:
+            if entry is not None:
+                del self.__entries[key]
+            self.__misses += 1
+            return None
+        self.__entries.move_to_end(key)
+        self.__hits += 1
+        return entry[1]
+
+    def put(self, prompt: str, response: str, scope: str | None = None):
+        key = (scope, normalize_prompt(prompt))
+        self.__entries[key] = (time.monotonic(), response)
+        self.__entries.move_to_end(key)
+        while len(self.__entries) > self.capacity:
+            self.__entries.popitem(last=False)
+
+    def discard_scope(self, scope: str | None) -> int:
+        """Drop every entry of one conversation; returns how many were dropped."""
+        keys = [key for key in self.__entries if key[0] == scope]
+        for key in keys:
+            del self.__entries[key]
+        return len(keys)
+
+    def clear(self):
+        self.__entries.clear()
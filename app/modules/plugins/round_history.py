@@ -0,0 +1,271 @@
+import asyncio
+import sqlite3
+import time
+
+from array import array
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS samples (
+    server TEXT NOT NULL,
+    ts REAL NOT NULL,
+    gamestate INTEGER NOT NULL,
+    round_duration INTEGER NOT NULL,
+    players INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS rounds (
+    server TEXT NOT NULL,
+    started REAL NOT NULL,
+    ended REAL NOT NULL,
+    length INTEGER NOT NULL,
+    peak_players INTEGER NOT NULL,
+    avg_players REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS samples_server_ts ON samples (server, ts);
+CREATE INDEX IF NOT EXISTS rounds_server ON rounds (server);
+"""
+
+_HOURS = 24
+
+
+class SampleRing:
+    """Fixed-size ring buffer of status samples stored in parallel typed arrays."""
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.__timestamps = array("d", [0.0]) * capacity
+        self.__states = array("b", [0]) * capacity
+        self.__durations = array("L", [0]) * capacity
+        self.__players = array("H", [0]) * capacity
+        self.__next = 0
+        self.__size = 0
+        self.__unflushed = 0
+
+    def __len__(self) -> int:
+        return self.__size
+
+    def append(self, timestamp: float, gamestate: int, round_duration: int, players: int):
+        index = self.__next
+        self.__timestamps[index] = timestamp
+        self.__states[index] = gamestate
+        self.__durations[index] = max(0, round_duration)
+        self.__players[index] = min(max(0, players), 0xFFFF)
+        self.__next = (index + 1) % self.capacity
+        self.__size = min(self.__size + 1, self.capacity)
+        self.__unflushed = min(self.__unflushed + 1, self.capacity)
+
+    def unflushed(self) -> list[tuple[float, int, int, int]]:
+        """Return samples not yet flushed, oldest first."""
+        count = self.__unflushed
+        start = self.__next - count
+        return [
+            (self.__timestamps[i], self.__states[i], self.__durations[i], self.__players[i])
+            for i in (index % self.capacity for index in range(start, start + count))
+        ]
+
+    def mark_flushed(self, count: int):
+        """Mark the oldest ``count`` unflushed samples as written."""
+        self.__unflushed = max(0, self.__unflushed - count)
+
+
+class RoundRecord:
+    __slots__ = ("started", "ended", "length", "peak_players", "avg_players")
+
+    def __init__(self, started: float, ended: float, length: int, peak_players: int,
+                 avg_players: float):
+        self.started = started
+        self.ended = ended
+        self.length = length
+        self.peak_players = peak_players
+        self.avg_players = avg_players
+
+
+class RoundHistory:
+    """Recent samples, round boundaries and running aggregates for one server.
+
+    Aggregates are updated incrementally as samples arrive, so reading them
+    never scans the stored history.
+    """
+
+    def __init__(self, server: str, capacity: int):
+        self.server = server
+        self.samples = SampleRing(capacity)
+        self.__pending_rounds: list[RoundRecord] = []
+        # Current round
+        self.__round_started: float | None = None
+        self.__round_length = 0
+        self.__round_peak = 0
+        self.__round_players = 0
+        self.__round_samples = 0
+        # All finished rounds
+        self.rounds = 0
+        self.__total_length = 0
+        self.longest_round = 0
+        self.peak_players = 0
+        self.__total_avg_players = 0.0
+        # Players over the last 24 hours, one slot per hour
+        self.__hour_ids = array("q", [-1]) * _HOURS
+        self.__hour_peaks = array("H", [0]) * _HOURS
+        self.__hour_sums = array("Q", [0]) * _HOURS
+        self.__hour_counts = array("L", [0]) * _HOURS
+
+    def record(self, gamestate: int, round_duration: int, players: int, in_round: bool,
+               timestamp: float | None = None) -> RoundRecord | None:
+        """Add a sample. Returns the finished round when this sample closes one."""
+        timestamp = time.time() if timestamp is None else timestamp
+        self.samples.append(timestamp, gamestate, round_duration, players)
+        self.__record_hour(timestamp, players)
+
+        finished = None
+        if in_round:
+            if self.__round_started is None:
+                self.__round_started = timestamp - round_duration
+                self.__round_peak = self.__round_players = self.__round_samples = 0
+            self.__round_length = round_duration
+            self.__round_peak = max(self.__round_peak, players)
+            self.__round_players += players
+            self.__round_samples += 1
+        elif self.__round_started is not None:
+            finished = self.__finish_round(timestamp)
+        return finished
+
+    def __finish_round(self, timestamp: float) -> RoundRecord:
+        record = RoundRecord(
+            started=self.__round_started,
+            ended=timestamp,
+            length=self.__round_length,
+            peak_players=self.__round_peak,
+            avg_players=self.__round_players / max(1, self.__round_samples),
+        )
+        self.__round_started = None
+        self.__pending_rounds.append(record)
+        self.__add_round(record.length, record.peak_players, record.avg_players)
+        return record
+
+    def __add_round(self, length: int, peak_players: int, avg_players: float, count: int = 1):
+        self.rounds += count
+        self.__total_length += length * count
+        self.__total_avg_players += avg_players * count
+        self.longest_round = max(self.longest_round, length)
+        self.peak_players = max(self.peak_players, peak_players)
+
+    def __record_hour(self, timestamp: float, players: int):
+        hour = int(timestamp // 3600)
+        slot = hour % _HOURS
+        if self.__hour_ids[slot] != hour:
+            self.__hour_ids[slot] = hour
+            self.__hour_peaks[slot] = 0
+            self.__hour_sums[slot] = 0
+            self.__hour_counts[slot] = 0
+        self.__hour_peaks[slot] = max(self.__hour_peaks[slot], min(players, 0xFFFF))
+        self.__hour_sums[slot] += max(0, players)
+        self.__hour_counts[slot] += 1
+
+    @property
+    def average_round_length(self) -> float:
+        return self.__total_length / self.rounds if self.rounds else 0.0
+
+    @property
+    def average_round_players(self) -> float:
+        return self.__total_avg_players / self.rounds if self.rounds else 0.0
+
+    @property
+    def current_round_peak(self) -> int | None:
+        return self.__round_peak if self.__round_started is not None else None
+
+    def last_day(self, now: float | None = None) -> tuple[int, float]:
+        """Peak and average player count over the last 24 hours."""
+        current_hour = int((time.time() if now is None else now) // 3600)
+        peak = 0
+        total = 0
+        count = 0
+        for slot in range(_HOURS):
+            if current_hour - self.__hour_ids[slot] < _HOURS:
+                peak = max(peak, self.__hour_peaks[slot])
+                total += self.__hour_sums[slot]
+                count += self.__hour_counts[slot]
+        return peak, (total / count if count else 0.0)
+
+    def hourly(self, now: float | None = None) -> list[tuple[int, int, float]]:
+        """Downsampled (hour, peak, average) player counts for the last 24 hours, oldest first."""
+        current_hour = int((time.time() if now is None else now) // 3600)
+        result = []
+        for hour in range(current_hour - _HOURS + 1, current_hour + 1):
+            slot = hour % _HOURS
+            if self.__hour_ids[slot] == hour and self.__hour_counts[slot]:
+                result.append((hour, self.__hour_peaks[slot],
+                               self.__hour_sums[slot] / self.__hour_counts[slot]))
+        return result
+
+    def pending_rounds(self) -> list[RoundRecord]:
+        return list(self.__pending_rounds)
+
+    def mark_rounds_flushed(self, count: int):
+        del self.__pending_rounds[:count]
+
+    def load_totals(self, rounds: int, average_length: float, longest: int, peak_players: int,
+                    average_players: float):
+        """Seed the round aggregates with totals read back from storage."""
+        if rounds:
+            self.__add_round(average_length, peak_players, average_players, count=rounds)
+            self.longest_round = max(self.longest_round, longest)
+
+
+class RoundHistoryStore:
+    """SQLite persistence for RoundHistory. All I/O runs in a worker thread.
+
+    Samples older than ``retention`` seconds are deleted on every flush
+    (0 - samples are kept forever); finished rounds are always kept.
+    """
+
+    def __init__(self, path: str, retention: float = 0):
+        self.path = path
+        self.retention = retention
+
+    def __connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path)
+        connection.executescript(_SCHEMA)
+        return connection
+
+    async def flush(self, history: RoundHistory):
+        samples = history.samples.unflushed()
+        rounds = history.pending_rounds()
+        if not samples and not rounds:
+            return
+        await asyncio.to_thread(self.__write, history.server, samples, rounds)
+        # Only now: after a failed write the same data is retried on the next flush.
+        history.samples.mark_flushed(len(samples))
+        history.mark_rounds_flushed(len(rounds))
+
+    def __write(self, server: str, samples: list, rounds: list[RoundRecord]):
+        connection = self.__connect()
+        try:
+            with connection:
+                connection.executemany(
+                    "INSERT INTO samples VALUES (?, ?, ?, ?, ?)",
+                    ((server, *sample) for sample in samples))
+                connection.executemany(
+                    "INSERT INTO rounds VALUES (?, ?, ?, ?, ?, ?)",
+                    ((server, r.started, r.ended, r.length, r.peak_players, r.avg_players)
+                     for r in rounds))
+                if self.retention:
+                    connection.execute(
+                        "DELETE FROM samples WHERE server = ? AND ts < ?",
+                        (server, time.time() - self.retention))
+        finally:
+            connection.close()
+
+    async def load_totals(self, history: RoundHistory):
+        totals = await asyncio.to_thread(self.__read_totals, history.server)
+        history.load_totals(*totals)
+
+    def __read_totals(self, server: str) -> tuple:
+        connection = self.__connect()
+        try:
+            row = connection.execute(
+                "SELECT COUNT(*), AVG(length), MAX(length), MAX(peak_players), AVG(avg_players) "
+                "FROM rounds WHERE server = ?", (server,)).fetchone()
+        finally:
+            connection.close()
+        count, average_length, longest, peak, average_players = row
+        return (count, average_length or 0.0, longest or 0, peak or 0, average_players or 0.0)
@@ -0,0 +1,69 @@
+import time
+
+from collections import OrderedDict
+
+
+class ThreadRegistry:
+    """LRU map of conversation keys (a channel or a user) to OpenAI thread ids.
+
+    ``put`` and ``evict_idle`` return the thread ids that fell out of the map
+    so the caller can delete them remotely. Last-use times are wall-clock so
+    the map can be saved with ``dump`` and restored with ``load``.
+    """
+
+    def __init__(self, capacity: int, idle_timeout: float):
+        self.capacity = max(1, capacity)
+        self.idle_timeout = idle_timeout
+        self.__threads: OrderedDict[str, tuple[str, float]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self.__threads)
+
+    def get(self, key: str, now: float | None = None) -> str | None:
+        entry = self.__threads.get(key)
+        if entry is None:
+            return None
+        self.__threads[key] = (entry[0], time.time() if now is None else now)
+        self.__threads.move_to_end(key)
+        return entry[0]
+
+    def peek(self, key: str) -> str | None:
+        entry = self.__threads.get(key)
+        return entry[0] if entry is not None else None
+
+    def put(self, key: str, thread_id: str, now: float | None = None) -> list[str]:
+        self.__threads[key] = (thread_id, time.time() if now is None else now)
+        self.__threads.move_to_end(key)
+        evicted = []
+        while len(self.__threads) > self.capacity:
+            evicted.append(self.__threads.popitem(last=False)[1][0])
+        return evicted
+
+    def pop(self, key: str) -> str | None:
+        entry = self.__threads.pop(key, None)
+        return entry[0] if entry is not None else None
+
+    def evict_idle(self, now: float | None = None) -> list[str]:
+        if not self.idle_timeout:
+            return []
+        now = time.time() if now is None else now
+        evicted = []
+        # Least recently used first, so the scan stops at the first live entry.
+        while self.__threads:
+            key, (thread_id, last_used) = next(iter(self.__threads.items()))
+            if now - last_used < self.idle_timeout:
+                break
+            del self.__threads[key]
+            evicted.append(thread_id)
+        return evicted
+
+    def dump(self) -> dict[str, list]:
+        return {key: [thread_id, last_used] for key, (thread_id, last_used) in self.__threads.items()}
+
+    def load(self, data: dict[str, list]) -> list[str]:
+        """Restore a saved map; returns the thread ids that no longer fit."""
+        self.__threads.clear()
+        evicted = []
+        for key, (thread_id, last_used) in sorted(data.items(), key=lambda item: item[1][1]):
+            evicted.extend(self.put(str(key), str(thread_id), float(last_used)))
+        return evicted
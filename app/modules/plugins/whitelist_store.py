@@ -0,0 +1,115 @@
+import asyncio
+import os
+
+import aiofiles
+import aiofiles.os
+
+
+class WhitelistStore:
+    """Whitelisted names held in memory with write-behind persistence.
+
+    Membership checks use an in-memory index (a dict, so the file order is
+    kept). Each change is appended to ``<path>.journal`` right away;
+    ``compact`` rewrites ``path`` atomically from the index and empties the
+    journal. ``load`` replays a leftover journal, so changes made after the
+    last compaction survive a crash.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.journal_path = f"{path}.journal"
+        self.__names: dict[str, None] = {}
+        self.__journal_entries = 0
+        self.__lock = asyncio.Lock()
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.__names
+
+    def __len__(self) -> int:
+        return len(self.__names)
+
+    def __iter__(self):
+        return iter(list(self.__names))
+
+    @property
+    def journal_entries(self) -> int:
+        """Changes not yet written to the whitelist file."""
+        return self.__journal_entries
+
+    async def load(self):
+        names: dict[str, None] = {}
+        if os.path.isfile(self.path):
+            async with aiofiles.open(self.path, "r", encoding="utf-8") as file:
+                for line in (await file.read()).splitlines():
+                    if line.strip():
+                        names[line.strip()] = None
+        entries = 0
+        if os.path.isfile(self.journal_path):
+            async with aiofiles.open(self.journal_path, "r", encoding="utf-8") as file:
+                for line in (await file.read()).splitlines():
+                    operation, name = line[:1], line[1:]
+                    if not name:
+                        continue
+                    if operation == "+":
+                        names[name] = None
+                    elif operation == "-":
+                        names.pop(name, None)
+                    entries += 1
+        self.__names = names
+        self.__journal_entries = entries
+
+    async def add(self, name: str) -> bool:
+        return await self.update(added=[name]) == 1
+
+    async def remove(self, name: str) -> bool:
+        return await self.update(removed=[name]) == 1
+
+    async def update(self, added: list[str] = (), removed: list[str] = ()) -> int:
+        """Apply several changes with one journal write; returns how many took effect."""
+        for name in added:
+            self.__check_name(name)
+        # The index changes first so concurrent callers see each other's changes.
+        lines = []
+        for name in added:
+            if name not in self.__names:
+                self.__names[name] = None
+                lines.append(f"+{name}\n")
+        for name in removed:
+            if name in self.__names:
+                del self.__names[name]
+                lines.append(f"-{name}\n")
+        if not lines:
+            return 0
+        try:
+            async with self.__lock:
+                async with aiofiles.open(self.journal_path, "a", encoding="utf-8") as file:
+                    await file.write("".join(lines))
+                self.__journal_entries += len(lines)
+        except BaseException:
+            for line in lines:
+                if line[0] == "+":
+                    self.__names.pop(line[1:-1], None)
+                else:
+                    self.__names[line[1:-1]] = None
+            raise
+        return len(lines)
+
+    async def compact(self):
+        """Write the whole list to a temporary file and swap it in, then empty the journal."""
+        async with self.__lock:
+            if not self.__journal_entries and os.path.isfile(self.path):
+                return
+            temp_path = f"{self.path}.tmp"
+            async with aiofiles.open(temp_path, "w", encoding="utf-8") as file:
+                await file.write("".join(f"{name}\n" for name in self.__names))
+                await file.flush()
+                await asyncio.to_thread(os.fsync, file.fileno())
+            await aiofiles.os.replace(temp_path, self.path)
+            async with aiofiles.open(self.journal_path, "w", encoding="utf-8"):
+                pass
+            self.__journal_entries = 0
+
+    @staticmethod
+    def __check_name(name: str):
+        if not name or "\n" in name or "\r" in name:
+            raise ValueError(f"Invalid whitelist name: {name!r}")
@@ -0,0 +1,165 @@
+import asyncio
+import itertools
+import logging
+import time
+
+from typing import Awaitable, Callable, Generic, TypeVar
+
+
+T = TypeVar("T")
+
+logger = logging.getLogger("ai")
+
+
+class Job(Generic[T]):
+    """A submitted item; lower ``priority`` runs first, FIFO within a priority."""
+
+    __slots__ = ("item", "priority", "seq", "enqueued_at", "deadline", "cancelled")
+
+    def __init__(self, item: T, priority: int, seq: int, timeout: float | None):
+        self.item = item
+        self.priority = priority
+        self.seq = seq
+        self.enqueued_at = time.monotonic()
+        self.deadline = self.enqueued_at + timeout if timeout else None
+        self.cancelled = False
+
+    def __lt__(self, other: "Job") -> bool:
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+    def is_expired(self, now: float) -> bool:
+        return self.deadline is not None and now > self.deadline
+
+
+class WorkerPool(Generic[T]):
+    """A fixed number of asyncio workers draining a shared priority queue.
+
+    ``handler`` is awaited once per submitted item; exceptions it raises are
+    logged and do not stop the worker. Items still queued past their deadline
+    are passed to ``on_expired`` instead, and cancelled items are skipped.
+    Queue wait times are tracked so the caller can report them.
+    """
+
+    def __init__(self, handler: Callable[[T], Awaitable[None]], workers: int,
+                 on_expired: Callable[[T], Awaitable[None]] | None = None):
+        self.__handler = handler
+        self.__on_expired = on_expired
+        self.__size = max(1, workers)
+        self.__queue: asyncio.PriorityQueue[Job[T]] = asyncio.PriorityQueue()
+        # Queued jobs by sequence number; insertion order keeps the oldest first.
+        self.__pending: dict[int, Job[T]] = {}
+        self.__seq = itertools.count()
+        self.__workers: list[asyncio.Task] = []
+        self.__busy = 0
+        self.__processed = 0
+        self.__expired = 0
+        self.__cancelled = 0
+        self.__total_wait = 0.0
+        self.__max_wait = 0.0
+
+    @property
+    def size(self) -> int:
+        return self.__size
+
+    @property
+    def depth(self) -> int:
+        return len(self.__pending)
+
+    @property
+    def busy(self) -> int:
+        return self.__busy
+
+    @property
+    def processed(self) -> int:
+        return self.__processed
+
+    @property
+    def expired(self) -> int:
+        return self.__expired
+
+    @property
+    def cancelled(self) -> int:
+        return self.__cancelled
+
+    @property
+    def average_wait(self) -> float:
+        return self.__total_wait / self.__processed if self.__processed else 0.0
+
+    @property
+    def max_wait(self) -> float:
+        return self.__max_wait
+
+    @property
+    def oldest_wait(self) -> float:
+        """How long the longest-queued job has been waiting so far."""
+        oldest = next(iter(self.__pending.values()), None)
+        return time.monotonic() - oldest.enqueued_at if oldest is not None else 0.0
+
+    @property
+    def is_running(self) -> bool:
+        return bool(self.__workers)
+
+    def start(self):
+        if self.__workers:
+            return
+        self.__workers = [
+            asyncio.create_task(self.__work(), name=f"worker-{index}")
+            for index in range(self.__size)
+        ]
+
+    async def stop(self):
+        workers, self.__workers = self.__workers, []
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+
+    async def submit(self, item: T, priority: int = 0, timeout: float | None = None) -> Job[T]:
+        job = Job(item, priority, next(self.__seq), timeout)
+        self.__pending[job.seq] = job
+        await self.__queue.put(job)
+        return job
+
+    def cancel(self, job: Job[T]) -> bool:
+        """Drop a job that is still queued; returns False once a worker has taken it."""
+        if self.__pending.pop(job.seq, None) is None:
+            return False
+        job.cancelled = True
+        self.__cancelled += 1
+        return True
+
+    async def join(self):
+        await self.__queue.join()
+
+    async def __work(self):
+        while True:
+            job = await self.__queue.get()
+            try:
+                if job.cancelled:
+                    continue
+                del self.__pending[job.seq]
+                now = time.monotonic()
+                if job.is_expired(now):
+                    self.__expired += 1
+                    if self.__on_expired is not None:
+                        await self.__call(self.__on_expired, job.item)
+                    continue
+                wait = now - job.enqueued_at
+                self.__total_wait += wait
+                self.__max_wait = max(self.__max_wait, wait)
+                self.__busy += 1
+                try:
+                    await self.__call(self.__handler, job.item)
+                finally:
+                    self.__busy -= 1
+                    self.__processed += 1
+            finally:
+                self.__queue.task_done()
+
+    @staticmethod
+    async def __call(callback: Callable[[T], Awaitable[None]], item: T):
+        try:
+            await callback(item)
+        except asyncio.CancelledError:
+            raise
+        except Exception as ex:
+            logger.error(f"Worker failed to handle an item: {ex}")
@@ -1,6 +1,9 @@
 from discord.ext import commands, tasks
-from .plugins.byond_topic import queryStatus
-from configs.modules import RoundStatusConfig
+from .plugins.byond_topic import RoundStatusSnapshot, get_client, close_client, close_clients
+from .plugins.poll_scheduler import PollScheduler
+from .plugins.round_history import RoundHistory, RoundHistoryStore
+from .plugins.push_listener import PushListener
+from configs.modules import RoundStatusConfig, RoundStatusServer
 
 import asyncio
 import enum
@@ -9,10 +12,29 @@ import time
 import discord
 import loggers
 import ipaddress
+import aiofiles
+import os
+import yaml
 
 logger = loggers.setup_logger("roundstatus")
 config = RoundStatusConfig()
 
+_MESSAGES_PATH = "./settings/round_status_messages.yaml"
+# Fields a push must carry: anything missing would be shown (and recorded) as 0.
+_PUSH_REQUIRED_FIELDS = ("gamestate", "round_duration", "players")
+
+
+async def load_messages() -> dict:
+    if not os.path.isfile(_MESSAGES_PATH):
+        return {}
+    async with aiofiles.open(_MESSAGES_PATH, "r") as file:
+        return yaml.safe_load(await file.read()) or {}
+
+
+async def save_messages(messages: dict) -> None:
+    async with aiofiles.open(_MESSAGES_PATH, "w") as file:
+        await file.write(yaml.dump(messages))
+
 
 def check_roles(ctx: commands.Context):
     if any(role.id == config.main_role for role in ctx.author.roles):
@@ -44,11 +66,12 @@ class ServerConnector:
     def __init__(self, host, port):
         self.host = host
         self.port = port
+        self.client = get_client(host, port)
 
     async def query_status(self):
         try:
             logger.info(f"Trying get query status from {self.host}:{self.port}")
-            response_data = await queryStatus(self.host, self.port)
+            response_data = await self.client.query_status()
             return response_data
         except ConnectionRefusedError:
             logger.warning("Connection refused by the server.")
@@ -59,11 +82,60 @@ class ServerConnector:
         except ConnectionError as conn_err:
             logger.info(f"Connection error: {conn_err}")
             raise
+        except TimeoutError:
+            logger.warning("Server did not respond in time.")
+            raise
         except Exception as ex:
             logger.warning(f"An error occurred: {ex}")
             raise
 
 
+class ServerState:
+    def __init__(self, server: RoundStatusServer):
+        self.server = server
+        self.connector = ServerConnector(server.host, server.port)
+        self.last_game_state = GameState.UNKNOWN
+        self.init = False
+        self.is_notification_available_sent = False
+        self.failed_attempts = 0
+        self.channel: discord.TextChannel | None = None
+        self.message: discord.Message | None = None
+        self.fingerprint: tuple | None = None
+        self.round_ended_at: str | None = None
+        self.edits_sent = 0
+        self.edits_suppressed = 0
+        self.last_push: float | None = None
+        self.lock = asyncio.Lock()
+        self.scheduler = PollScheduler(
+            interval=config.poll_interval,
+            min_interval=config.poll_interval_min,
+            max_interval=config.poll_interval_max,
+            idle_interval=config.poll_interval_idle,
+        )
+
+    def matches(self, server: RoundStatusServer) -> bool:
+        return self.server.channel == server.channel
+
+    def update_address(self, server: RoundStatusServer):
+        """Point the connector at a changed host or port, keeping the status message."""
+        if self.connector.host == server.host and self.connector.port == server.port:
+            return
+        self.connector = ServerConnector(server.host, server.port)
+        self.failed_attempts = 0
+        self.is_notification_available_sent = False
+        self.scheduler.fast()
+
+    def is_push_fresh(self) -> bool:
+        return (self.last_push is not None and
+                time.monotonic() - self.last_push < config.push_consistency_interval)
+
+    def register_failure(self):
+        self.failed_attempts += 1
+        if self.failed_attempts >= 5:
+            self.init = False
+            self.failed_attempts = 0
+
+
 class RoundStatus(commands.Cog):
     __footer_icon = "https://cdn.discordapp.com/attachments/" \
                     "593969947579777035/1248147974245056553/" \
@@ -78,129 +150,377 @@ class RoundStatus(commands.Cog):
 
     def __init__(self, bot: commands.Bot):
         self.__bot = bot
-        self.__channel_alert_id = config.channel
-        self.__last_game_state = GameState.UNKNOWN
-        self.__init = False
-        self.__is_notification_available_sent = False
-        self.__failed_attempts = 0
-        self.__channel_alert: discord.TextChannel
-
-    def cog_unload(self):
+        self.__servers: dict[str, ServerState] = {}
+        self.__messages: dict[str, dict] = {}
+        self.__history: dict[str, RoundHistory] = {}
+        self.__history_store = RoundHistoryStore(config.history_path, config.history_retention)
+        self.__push_listener: PushListener | None = None
+
+    async def cog_load(self):
+        # on_ready is not dispatched again after `!reload roundstatus`.
+        if self.__bot.is_ready():
+            await self.__start()
+
+    async def cog_unload(self):
         self.__task_loop.cancel()
+        self.__flush_loop.cancel()
+        if self.__push_listener is not None:
+            await self.__push_listener.stop()
+        await self.__flush_history()
+        await close_clients()
+
+    async def __start(self):
+        if self.__task_loop.is_running():
+            return
+        await self.__restore_messages()
+        await self.__load_history()
+        self.__task_loop.start()
+        self.__flush_loop.start()
+        await self.__start_push_listener()
 
-    def server_availability(self):
-        if self.__is_notification_available_sent:
+    async def __start_push_listener(self):
+        if not config.push_enabled:
             return
-        logger.warning("Сервер выключен.")
-        self.__is_notification_available_sent = True
+        if not config.push_secret:
+            logger.warning("push_enabled is set but push_secret is empty, push listener disabled")
+            return
+        listener = PushListener(config.push_host, config.push_port, config.push_secret, self.__on_push)
+        try:
+            await listener.start()
+        except OSError as ex:
+            logger.error(f"Could not start push listener on {config.push_host}:{config.push_port}: {ex}")
+            return
+        self.__push_listener = listener
+        logger.info(f"Push listener started on {config.push_host}:{config.push_port}")
+
+    async def __on_push(self, name: str, response_data: RoundStatusSnapshot):
+        state = self.__servers.get(name)
+        if state is None:
+            logger.warning(f"Push for unknown server '{name}'")
+            raise KeyError(name)
+        missing = [field for field in _PUSH_REQUIRED_FIELDS
+                   if response_data.get_int(field, None) is None]
+        if missing:
+            logger.warning(f"[{name}] Rejected push without {', '.join(missing)}")
+            raise ValueError(f"{', '.join(missing)} required")
+        if state.channel is None:
+            logger.warning(f"[{name}] channel {state.server.channel} not found")
+            return
+        logger.info(f"[{name}] Received push: gamestate={response_data.gamestate}, "
+                    f"players={response_data.players}")
+        state.last_push = time.monotonic()
+        state.is_notification_available_sent = False
+        state.failed_attempts = 0
+        await self.__apply_status(state, response_data)
+        self.__reschedule()
+
+    def __get_history(self, name: str) -> RoundHistory:
+        history = self.__history.get(name)
+        if history is None:
+            history = RoundHistory(name, config.history_capacity)
+            self.__history[name] = history
+        return history
+
+    async def __load_history(self):
+        for server in config.servers:
+            try:
+                await self.__history_store.load_totals(self.__get_history(server.name))
+            except Exception as ex:
+                logger.warning(f"[{server.name}] Could not load round history: {ex}")
+
+    @tasks.loop(seconds=config.history_flush_interval)
+    async def __flush_loop(self):
+        await self.__flush_history()
+
+    async def __flush_history(self):
+        for history in self.__history.values():
+            try:
+                await self.__history_store.flush(history)
+            except Exception as ex:
+                logger.error(f"[{history.server}] Could not save round history: {ex}")
+
+    async def __restore_messages(self):
+        try:
+            self.__messages = await load_messages()
+        except (OSError, yaml.YAMLError) as ex:
+            logger.warning(f"Could not load saved status messages: {ex}")
+            self.__messages = {}
+
+        for state in await self.__sync_servers():
+            saved = self.__messages.get(state.server.name)
+            if not saved or state.channel is None or saved.get("channel") != state.server.channel:
+                continue
+            try:
+                state.message = await state.channel.fetch_message(saved["message"])
+            except discord.NotFound:
+                logger.info(f"[{state.server.name}] Saved status message is gone, a new one will be posted.")
+                continue
+            except discord.HTTPException as ex:
+                logger.warning(f"[{state.server.name}] Could not fetch the saved status message: {ex}")
+                continue
+            state.init = True
+            state.last_game_state = GameState[saved.get("game_state", GameState.UNKNOWN.name)]
+            logger.info(f"[{state.server.name}] Reusing status message {state.message.id}")
+
+    async def __remember_message(self, state: ServerState):
+        entry = {
+            "channel": state.server.channel,
+            "message": state.message.id,
+            "game_state": state.last_game_state.name,
+        }
+        if self.__messages.get(state.server.name) == entry:
+            return
+        self.__messages[state.server.name] = entry
+        try:
+            await save_messages(self.__messages)
+        except OSError as ex:
+            logger.warning(f"Could not save status messages: {ex}")
 
-    @tasks.loop(seconds=5)
+    def server_availability(self, state: ServerState):
+        if state.is_notification_available_sent:
+            return
+        logger.warning(f"[{state.server.name}] Сервер выключен.")
+        state.is_notification_available_sent = True
+
+    async def __sync_servers(self) -> list[ServerState]:
+        previous = {(state.connector.host, int(state.connector.port)) for state in self.__servers.values()}
+        servers = {}
+        for server in config.servers:
+            state = self.__servers.get(server.name)
+            if state is None or not state.matches(server):
+                state = ServerState(server)
+            else:
+                state.update_address(server)
+            state.server = server
+            if state.channel is None:
+                state.channel = self.__bot.get_channel(server.channel)
+            servers[server.name] = state
+        self.__servers = servers
+        # Connections to an address no server uses any more would stay open until unload.
+        in_use = {(state.connector.host, int(state.connector.port)) for state in servers.values()}
+        for host, port in previous - in_use:
+            await close_client(host, port)
+        return list(servers.values())
+
+    @tasks.loop(seconds=config.poll_interval)
     async def __task_loop(self):
         try:
             await self.__check_tick()
         except Exception as ex:
             logger.error(f"An error occurred: {ex}")
+        self.__reschedule()
+
+    def __reschedule(self):
+        if not self.__servers:
+            interval = config.poll_interval
+        else:
+            next_poll = min(state.scheduler.next_poll for state in self.__servers.values())
+            interval = max(config.poll_interval_min, next_poll - time.monotonic())
+        if interval != self.__task_loop.seconds:
+            self.__task_loop.change_interval(seconds=interval)
 
     async def __check_tick(self):
-        if not config.host or not config.port:
-            logger.warning("host or port not specified")
+        now = time.monotonic()
+        states = [state for state in await self.__sync_servers() if state.scheduler.is_due(now)]
+        semaphore = asyncio.Semaphore(config.max_concurrency)
+
+        async def check_bounded(state: ServerState):
+            async with semaphore:
+                await self.__check_server(state)
+
+        results = await asyncio.gather(
+            *(check_bounded(state) for state in states), return_exceptions=True)
+        for state, result in zip(states, results):
+            if isinstance(result, Exception):
+                logger.error(f"[{state.server.name}] An error occurred: {result}")
+
+    async def __check_server(self, state: ServerState):
+        server = state.server
+        if not server.host or not server.port:
+            logger.warning(f"[{server.name}] host or port not specified")
+            state.scheduler.idle()
+            return
+        if state.channel is None:
+            logger.warning(f"[{server.name}] channel {server.channel} not found")
+            state.scheduler.idle()
             return
 
         try:
-            response_data = await ServerConnector(config.host, config.port).query_status()
-            self.__is_notification_available_sent = False
+            response_data = await state.connector.query_status()
+            state.is_notification_available_sent = False
         except ConnectionRefusedError:
-            self.server_availability()
-            self.__failed_attempts += 1
-            if self.__failed_attempts >= 5:
-                self.__init = False
-                self.__failed_attempts = 0
+            self.server_availability(state)
+            state.register_failure()
+            state.scheduler.failure()
             return
         except (ConnectionError, ConnectionResetError, Exception):
-            self.__failed_attempts += 1
-            if self.__failed_attempts >= 5:
-                self.__init = False
-                self.__failed_attempts = 0
+            state.register_failure()
+            state.scheduler.normal()
             return
 
-        self.__failed_attempts = 0
-        current_time = int(response_data["round_duration"][0])
-        game_state_value = int(response_data["gamestate"][0])
+        state.failed_attempts = 0
+        if response_data is None:
+            logger.warning(f"[{server.name}] Server returned an unexpected status response.")
+            state.scheduler.normal()
+            return
+        await self.__apply_status(state, response_data)
+
+    async def __apply_status(self, state: ServerState, response_data: RoundStatusSnapshot):
+        # Pushes and polls for the same server must not interleave.
+        async with state.lock:
+            await self.__update_status(state, response_data)
+
+    async def __update_status(self, state: ServerState, response_data: RoundStatusSnapshot):
+        server = state.server
+        current_time = response_data.round_duration
+        game_state_value = response_data.gamestate
 
         if game_state_value in GameState.LOBBY.value:
             current_game_state = GameState.LOBBY
         else:
             current_game_state = GameState(game_state_value)
 
-        logger.info(f"Game state: {current_game_state.name}. " 
+        logger.info(f"[{server.name}] Game state: {current_game_state.name}. "
                     f"Time: {time.strftime("%H:%M", time.gmtime(current_time))}")
 
-        self.__bot.custom_embed = self.__make_embed(
+        finished_round = self.__get_history(server.name).record(
+            gamestate=game_state_value,
+            round_duration=current_time,
+            players=response_data.players,
+            in_round=current_game_state == GameState.IN_GAME,
+        )
+        if finished_round is not None:
+            logger.info(f"[{server.name}] Round finished: {finished_round.length}s, "
+                        f"peak {finished_round.peak_players} players")
+
+        if current_game_state != GameState.ENDGAME:
+            state.round_ended_at = None
+        elif state.round_ended_at is None:
+            state.round_ended_at = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+        fingerprint = self.__render(
+            state=state,
             response_data=response_data,
             game_state=current_game_state,
-            current_time=current_time
+            current_time=current_time,
+            title=self.__embed_title(server),
         )
-        
-        if (not self.__init or
+
+        self.__schedule_next(state, current_game_state, current_time)
+
+        # IN_GAME is accepted as well: the slow cadence of a long round can
+        # step over the short ENDGAME phase entirely.
+        if (not state.init or
                 (current_game_state == GameState.STARTUP and
-                 current_game_state != self.__last_game_state and
-                 self.__last_game_state == GameState.ENDGAME)):
-            self.__custom_embed_message = await self.__channel_alert.send(embed=self.__bot.custom_embed)
-            await self.__channel_alert.send(
-                '<@&1227295722123296799> Новый раунд```byond://rockhill-game.ru:51143```'
+                 current_game_state != state.last_game_state and
+                 state.last_game_state in (GameState.ENDGAME, GameState.IN_GAME))):
+            embed = self.__make_embed(state, fingerprint)
+            state.message = await state.channel.send(embed=embed)
+            await state.channel.send(
+                f'<@&1227295722123296799> Новый раунд```{server.link}```'
             )
-            self.__init = True
+            state.init = True
+            state.fingerprint = fingerprint
+        elif fingerprint != state.fingerprint:
+            embed = self.__make_embed(state, fingerprint)
+            try:
+                await state.message.edit(embed=embed)
+            except discord.NotFound:
+                logger.warning(f"[{server.name}] Status message was deleted, a new one will be posted.")
+                state.init = False
+                return
+            state.fingerprint = fingerprint
+            state.edits_sent += 1
         else:
-            await self.__custom_embed_message.edit(embed=self.__bot.custom_embed)
-
-        self.__last_game_state = GameState(current_game_state.value)
-
-    def __make_embed(self, response_data, current_time, game_state):
+            state.edits_suppressed += 1
+
+        state.last_game_state = GameState(current_game_state.value)
+        await self.__remember_message(state)
+
+    @staticmethod
+    def __schedule_next(state: ServerState, game_state: GameState, current_time: int):
+        previous_interval = state.scheduler.interval
+        if state.is_push_fresh():
+            # The game server reports changes itself; polling is only a consistency check.
+            state.scheduler.defer(config.push_consistency_interval)
+        elif game_state in (GameState.ENDGAME, GameState.STARTUP):
+            state.scheduler.fast()
+        elif game_state == GameState.IN_GAME and current_time >= config.idle_after:
+            state.scheduler.idle()
+        else:
+            state.scheduler.normal()
+        if state.scheduler.interval != previous_interval:
+            logger.info(f"[{state.server.name}] Poll interval changed to "
+                        f"{state.scheduler.interval:.1f}s ({game_state.name})")
+
+    @staticmethod
+    def __embed_title(server: RoundStatusServer) -> str:
+        if len(config.servers) > 1:
+            return f"Раунд: {server.name}"
+        return "Раунд"
+
+    @staticmethod
+    def __render(state: ServerState, response_data: RoundStatusSnapshot, current_time,
+                 game_state, title) -> tuple:
+        """Describe the visible content of the status embed as a hashable fingerprint."""
         match game_state:
             case GameState.STARTUP:
-                embed = RoundStatus.__embed_template(
-                    color=discord.Color.orange(),
-                    status="Запуск сервера"
-                )
+                color = discord.Color.orange()
+                status = "Запуск сервера"
+                fields = ()
             case GameState.LOBBY:
-                embed = RoundStatus.__embed_template(
-                    color=discord.Color.blue(),
-                    status="Лобби"
-                )
+                color = discord.Color.blue()
+                status = "Лобби"
+                fields = ()
             case GameState.IN_GAME:
-                embed = RoundStatus.__embed_template(
-                    color=discord.Color.green(),
-                    status="Идёт раунд"
-                ).add_field(
-                    name="Количество игроков",
-                    value=response_data["players"][0] + " игрок(ов)",
-                ).add_field(
-                    name="Время раунда",
-                    value=time.strftime("%H:%M", time.gmtime(current_time)),
+                color = discord.Color.green()
+                status = "Идёт раунд"
+                fields = (
+                    ("Количество игроков", f"{response_data.players} игрок(ов)"),
+                    ("Время раунда", time.strftime("%H:%M", time.gmtime(current_time))),
                 )
             case GameState.ENDGAME:
-                embed = RoundStatus.__embed_template(
-                    color=discord.Color.dark_magenta(),
-                    status="Окончание раунда"
-                ).add_field(
-                    name="Раунд завершён",
-                    value=datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                color = discord.Color.dark_magenta()
+                status = "Окончание раунда"
+                fields = (
+                    ("Раунд завершён", state.round_ended_at),
                 )
             case _:
                 raise ValueError("Unknown game state")
 
+        return (title, color.value, status, fields)
+
+    def __make_embed(self, state: ServerState, fingerprint: tuple) -> discord.Embed:
+        title, color, status, fields = fingerprint
+        embed = RoundStatus.__embed_template(
+            title=title,
+            color=discord.Colour(color),
+            status=status
+        )
+        for name, value in fields:
+            embed.add_field(name=name, value=value)
+
+        if state.server is config.get_server():
+            self.__bot.custom_embed = embed
         return embed
 
-    def __embed_template(color: discord.Colour, status: str) -> discord.embeds.Embed:
-        return discord.Embed(
-            title="Раунд",
-            color=color,
-        ).set_footer(
-            text="Сплетено пауком",
-            icon_url=RoundStatus.__footer_icon,
-        ).set_thumbnail(
-            url=RoundStatus.__thumbnail_icon,
-        ).add_field(
+    __embed_base = {
+        "type": "rich",
+        "footer": {
+            "text": "Сплетено пауком",
+            "icon_url": __footer_icon,
+        },
+        "thumbnail": {
+            "url": __thumbnail_icon,
+        },
+    }
+
+    def __embed_template(title: str, color: discord.Colour, status: str) -> discord.embeds.Embed:
+        return discord.Embed.from_dict({
+            **RoundStatus.__embed_base,
+            "title": title,
+            "color": color.value,
+        }).add_field(
             name="Статус",
             value=status,
             inline=False,
@@ -212,30 +532,116 @@ class RoundStatus(commands.Cog):
 
     @commands.Cog.listener()
     async def on_ready(self):
-        logger.info(f"Channel is {self.__channel_alert_id}")
-        self.__channel_alert = self.__bot.get_channel(self.__channel_alert_id)
-        self.__task_loop.start()
+        for server in config.servers:
+            logger.info(f"[{server.name}] Channel is {server.channel}")
+        await self.__start()
 
     @commands.check(check_roles)
     @commands.command(name="rs_host")
-    async def setup_host(self, ctx: commands.Context, *, host: str):
+    async def setup_host(self, ctx: commands.Context, host: str, name: str | None = None):
         try:
             ipaddress.ip_address(host)
-            await config.async_set_host(host)
-            logger.info(f"User {ctx.author.display_name} set the host to {host}")
-            await ctx.reply(f"Host set to {host}")
         except ValueError:
             await ctx.reply("Invalid IP address")
+            return
+        try:
+            await config.async_set_host(host, name)
+        except KeyError:
+            await ctx.reply(f"Server {name} not found")
+            return
+        logger.info(f"User {ctx.author.display_name} set the host to {host}")
+        await ctx.reply(f"Host set to {host}")
 
     @commands.check(check_roles)
     @commands.command(name="rs_port")
-    async def setup_port(self, ctx: commands.Context, *, port: int):
+    async def setup_port(self, ctx: commands.Context, port: int, name: str | None = None):
         if port < 0 or port > 65535:
             await ctx.reply("Invalid port")
             return
 
+        try:
+            await config.async_set_port(port, name)
+        except KeyError:
+            await ctx.reply(f"Server {name} not found")
+            return
         logger.info(f"User {ctx.author.display_name} set the port to {port}")
-        await config.async_set_port(port)
+
+    @commands.check(check_main_role)
+    @commands.command(name="rs_add_server")
+    async def add_server(self, ctx: commands.Context, name: str, host: str, port: int,
+                         channel: int, link: str | None = None):
+        try:
+            ipaddress.ip_address(host)
+        except ValueError:
+            await ctx.reply("Invalid IP address")
+            return
+        if port < 0 or port > 65535:
+            await ctx.reply("Invalid port")
+            return
+
+        try:
+            await config.async_add_server(RoundStatusServer(name, host, port, channel, link))
+        except KeyError:
+            await ctx.reply(f"Server {name} already exists")
+            return
+        logger.info(f"User {ctx.author.display_name} added server {name} ({host}:{port})")
+        await ctx.reply(f"Server {name} added")
+
+    @commands.check(check_main_role)
+    @commands.command(name="rs_remove_server")
+    async def remove_server(self, ctx: commands.Context, name: str):
+        try:
+            await config.async_remove_server(name)
+        except KeyError:
+            await ctx.reply(f"Server {name} not found")
+            return
+        logger.info(f"User {ctx.author.display_name} removed server {name}")
+        await ctx.reply(f"Server {name} removed")
+
+    @commands.check(check_roles)
+    @commands.command(name="rs_servers")
+    async def list_servers(self, ctx: commands.Context):
+        lines = []
+        for server in config.servers:
+            state = self.__servers.get(server.name)
+            game_state = state.last_game_state.name if state else GameState.UNKNOWN.name
+            interval = state.scheduler.interval if state else config.poll_interval
+            edits_sent = state.edits_sent if state else 0
+            edits_suppressed = state.edits_suppressed if state else 0
+            lines.append(
+                f"{server.name}: {server.host}:{server.port} -> <#{server.channel}> "
+                f"({game_state}, every {interval:.1f}s, "
+                f"edits sent/suppressed: {edits_sent}/{edits_suppressed})")
+        await ctx.reply("\n".join(lines) or "No servers configured")
+
+    @commands.command(name="rs_stats")
+    async def stats(self, ctx: commands.Context, name: str | None = None):
+        server = config.get_server(name)
+        if server is None:
+            await ctx.reply(f"Server {name} not found")
+            return
+
+        history = self.__get_history(server.name)
+        day_peak, day_average = history.last_day()
+        lines = [
+            f"**{server.name}**",
+            f"Раундов сыграно: {history.rounds}",
+            f"Средняя длительность раунда: "
+            f"{time.strftime("%H:%M", time.gmtime(history.average_round_length))}",
+            f"Самый долгий раунд: {time.strftime("%H:%M", time.gmtime(history.longest_round))}",
+            f"Пик игроков: {history.peak_players}",
+            f"Среднее число игроков за раунд: {history.average_round_players:.1f}",
+            f"За 24 часа: пик {day_peak}, в среднем {day_average:.1f}",
+        ]
+        if history.current_round_peak is not None:
+            lines.append(f"Пик текущего раунда: {history.current_round_peak}")
+        hourly = history.hourly()
+        if hourly:
+            lines.append("По часам (пик / в среднем):")
+            lines.extend(
+                f"`{time.strftime("%H:00", time.localtime(hour * 3600))}` {peak} / {average:.1f}"
+                for hour, peak, average in hourly)
+        await ctx.reply("\n".join(lines))
 
     @commands.check(check_main_role)
     @commands.command(name="rs_add_role")
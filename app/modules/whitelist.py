@@ -1,8 +1,13 @@
-from discord.ext import commands
+from discord.ext import commands, tasks
 
 from configs.modules import WhitelistConfig
+from .plugins.whitelist_store import WhitelistStore
+import csv
+import discord
+import io
 import loggers
 import os
+import re
 
 
 FORBIDDEN_CHARS = [
@@ -32,11 +37,21 @@ FORBIDDEN_CHARS = [
     "~",
     "=",
     "+",
+    "\n",
+    "\r",
 ]
 
+_FORBIDDEN_PATTERN = re.compile("[" + re.escape("".join(FORBIDDEN_CHARS)) + "]")
+_NAME_SEPARATORS = re.compile(r"[\s,]+")
+_MAX_IMPORT_SIZE = 1024 * 1024
+_SUMMARY_LIMIT = 20
+_CSV_HEADERS = ("ckey", "key", "name", "byond")
+
 logger = loggers.setup_logger("whitelist")
 config = WhitelistConfig()
 
+_WHITELIST_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "whitelist.txt")
+
 
 def check_roles(ctx: commands.Context):
     if any(role.id == config.main_role for role in ctx.author.roles):
@@ -57,23 +72,89 @@ def check_main_role(ctx: commands.Context):
 
 
 def contains_forbidden_chars(name):
-    return any(char in name for char in FORBIDDEN_CHARS)
+    return _FORBIDDEN_PATTERN.search(name) is not None
+
+
+def split_names(text: str) -> list[str]:
+    """Names separated by spaces, commas or new lines, without duplicates."""
+    return list(dict.fromkeys(name for name in _NAME_SEPARATORS.split(text) if name))
+
+
+def read_import(filename: str, text: str) -> list[str]:
+    if filename.lower().endswith(".csv"):
+        # The first column holds the name; other columns (dates, notes) are ignored.
+        rows = [row[0].strip() for row in csv.reader(io.StringIO(text)) if row and row[0].strip()]
+        if rows and rows[0].lower() in _CSV_HEADERS:
+            rows = rows[1:]
+        return list(dict.fromkeys(rows))
+    return split_names(text)
+
+
+def validate_names(names: list[str]) -> tuple[list[str], list[str]]:
+    """Split names into valid and invalid ones with one scan of the joined text."""
+    # \0 is not a forbidden character, so the separators never match.
+    joined = "\0".join(names)
+    bad_positions = [match.start() for match in _FORBIDDEN_PATTERN.finditer(joined)]
+    if not bad_positions:
+        return names, []
+    valid, invalid = [], []
+    start, position = 0, 0
+    for name in names:
+        end = start + len(name)
+        while position < len(bad_positions) and bad_positions[position] < start:
+            position += 1
+        if position < len(bad_positions) and bad_positions[position] < end:
+            invalid.append(name)
+        else:
+            valid.append(name)
+        start = end + 1
+    return valid, invalid
+
+
+def format_summary(done_label: str, done: list[str], skipped_label: str, skipped: list[str],
+                   invalid: list[str]) -> str:
+    def preview(names: list[str]) -> str:
+        if not names:
+            return ""
+        shown = ", ".join(names[:_SUMMARY_LIMIT])
+        more = f" и ещё {len(names) - _SUMMARY_LIMIT}" if len(names) > _SUMMARY_LIMIT else ""
+        return f": {shown}{more}"
+
+    return (f"{done_label}: {len(done)}\n"
+            f"{skipped_label}: {len(skipped)}{preview(skipped)}\n"
+            f"Недопустимые имена: {len(invalid)}{preview(invalid)}")
 
 
 class Whitelist(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.description = "I'ma whitelist module!"
+        self.__store = WhitelistStore(_WHITELIST_PATH)
+
+    async def cog_load(self):
+        await self.__store.load()
+        logger.info(f"Loaded {len(self.__store)} whitelisted names from {_WHITELIST_PATH}, "
+                    f"{self.__store.journal_entries} journaled changes")
+        # Fold a journal left over from the last run into the file right away.
+        await self.__store.compact()
+        self.__compact_loop.start()
+
+    async def cog_unload(self):
+        self.__compact_loop.cancel()
+        await self.__store.compact()
+
+    @tasks.loop(seconds=config.compact_interval)
+    async def __compact_loop(self):
+        try:
+            await self.__store.compact()
+        except OSError as ex:
+            logger.error(f"Could not write {_WHITELIST_PATH}: {ex}")
 
     @commands.check(check_roles)
     @commands.command()
     async def whitelist(self, ctx, action, *, name):
-        current_directory = os.path.dirname(os.path.abspath(__file__))
-        file_path = os.path.join(current_directory, "whitelist.txt")
         action = action.lower()
-
-        # Отладочное сообщение
-        logger.info(f"Работаем с файлом: {file_path}")
+        name = name.strip()
         logger.info(f"Действие: {action}, пользователь: {name}")
 
         if contains_forbidden_chars(name):
@@ -82,33 +163,80 @@ class Whitelist(commands.Cog):
             )
             return
 
-        with open(file_path, "r") as f:
-            lines = f.readlines()
-
         if action == "add":
-            if name + "\n" in lines:
+            if not await self.__store.add(name):
                 await ctx.send(f"{name} уже есть в списке!")
                 return
-            with open(file_path, "a") as f:
-                f.write(name + "\n")
             await ctx.send(f"{name} было отправлено на опыты!")
             logger.warning(f"{ctx.author} добавил {name}")
 
         elif action == "remove":
-            if name + "\n" not in lines:
+            if not await self.__store.remove(name):
                 await ctx.send(f"{name} нет в списке!")
                 return
-            with open(file_path, "w") as f:
-                for line in lines:
-                    if line.strip("\n") != name:
-                        f.write(line)
             await ctx.send(f"{name} было отправлено в чистилище!")
             logger.warning(f"{ctx.author} удалил {name}")
 
         else:
             await ctx.send(f"Неизвестное действие: {action}")
 
+    async def __bulk_add(self, ctx: commands.Context, names: list[str]):
+        valid, invalid = validate_names(names)
+        added = [name for name in valid if name not in self.__store]
+        skipped = [name for name in valid if name in self.__store]
+        await self.__store.update(added=added)
+        # A bulk change lands in whitelist.txt as one atomic rewrite right away.
+        await self.__store.compact()
+        logger.warning(f"{ctx.author} добавил {len(added)} имён: {', '.join(added)}")
+        await ctx.reply(format_summary("Добавлено", added, "Уже в списке", skipped, invalid))
+
+    @commands.check(check_roles)
+    @commands.command(name="wl_bulk_add")
+    async def bulk_add(self, ctx: commands.Context, *, names: str):
+        await self.__bulk_add(ctx, split_names(names))
+
+    @commands.check(check_roles)
+    @commands.command(name="wl_bulk_remove")
+    async def bulk_remove(self, ctx: commands.Context, *, names: str):
+        valid, invalid = validate_names(split_names(names))
+        removed = [name for name in valid if name in self.__store]
+        missing = [name for name in valid if name not in self.__store]
+        await self.__store.update(removed=removed)
+        await self.__store.compact()
+        logger.warning(f"{ctx.author} удалил {len(removed)} имён: {', '.join(removed)}")
+        await ctx.reply(format_summary("Удалено", removed, "Не было в списке", missing, invalid))
+
+    @commands.check(check_roles)
+    @commands.command(name="wl_import")
+    async def import_names(self, ctx: commands.Context):
+        attachments = ctx.message.attachments
+        if not attachments:
+            await ctx.reply("Прикрепите к сообщению .txt или .csv файл с именами.")
+            return
+        attachment = attachments[0]
+        if attachment.size > _MAX_IMPORT_SIZE:
+            await ctx.reply("Файл слишком большой, максимум 1 МБ.")
+            return
+        try:
+            text = (await attachment.read()).decode("utf-8-sig")
+        except UnicodeDecodeError:
+            await ctx.reply("Файл должен быть в кодировке UTF-8.")
+            return
+        logger.info(f"{ctx.author} импортирует {attachment.filename}")
+        await self.__bulk_add(ctx, read_import(attachment.filename, text))
+
+    @commands.check(check_roles)
+    @commands.command(name="wl_export")
+    async def export_names(self, ctx: commands.Context):
+        content = "".join(f"{name}\n" for name in self.__store).encode("utf-8")
+        await ctx.reply(f"В списке {len(self.__store)} имён.",
+                        file=discord.File(io.BytesIO(content), filename="whitelist.txt"))
+
     @whitelist.error
+    @bulk_add.error
+    @bulk_remove.error
+    @import_names.error
+    @export_names.error
     async def whitelist_error(self, ctx: commands.Context, error):
         if isinstance(error, commands.CheckFailure):
             await ctx.send("Недостаточно прав для использования этой команды!")
@@ -0,0 +1,212 @@
+"""Load harness for the AI cog against a local fake OpenAI server.
+
+Sends simulated ``!mind`` prompts from fake Discord contexts through
+``Ai.prompt`` and the worker pool into ``OpenAIHandler`` talking to
+``fake_openai.py``, then reports throughput, queue wait and p50/p99
+end-to-end latency (prompt to the last reply or edit).
+
+Usage (from the repository root):
+
+    python benchmarks/ai_load.py [--requests 100] [--rate 0] [--workers 4] [--streaming]
+        [--thread-scope shared|channel|user] [--duplicates 0.0] [--latency 1.0]
+"""
+import argparse
+import asyncio
+import itertools
+import os
+import random
+import sys
+import tempfile
+import time
+
+import yaml
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+APP_DIR = os.path.join(BENCHMARKS_DIR, "..", "app")
+sys.path.insert(0, BENCHMARKS_DIR)
+sys.path.insert(0, APP_DIR)
+
+from fake_openai import add_server_arguments, server_from_arguments  # noqa: E402
+
+_ids = itertools.count(1)
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+class FakeMember:
+    def __init__(self, user_id: int):
+        self.id = user_id
+        self.display_name = f"user{user_id}"
+        self.roles = []
+
+
+class FakeChannel:
+    def __init__(self, channel_id: int):
+        self.id = channel_id
+
+
+class FakeMessage:
+    def __init__(self, ctx: "FakeContext", content: str = ""):
+        self.id = next(_ids)
+        self.content = content
+        self.__ctx = ctx
+
+    async def edit(self, content: str, **_):
+        self.content = content
+        self.__ctx.touch()
+        return self
+
+    async def reply(self, content: str, **_):
+        return await self.__ctx.reply(content)
+
+    def to_reference(self, **_):
+        return self
+
+
+class FakeTyping:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+
+class FakeContext:
+    """Just enough of ``commands.Context`` for the AI cog."""
+
+    def __init__(self, author: FakeMember, channel: FakeChannel):
+        self.author = author
+        self.channel = channel
+        self.message = FakeMessage(self)
+        self.sent_at = time.perf_counter()
+        self.first_reply_at: float | None = None
+        self.last_reply_at: float | None = None
+        self.replies = 0
+
+    def touch(self):
+        self.last_reply_at = time.perf_counter()
+        if self.first_reply_at is None:
+            self.first_reply_at = self.last_reply_at
+
+    async def reply(self, content: str, **_):
+        self.replies += 1
+        self.touch()
+        return FakeMessage(self, content)
+
+    async def send(self, content: str, **_):
+        return await self.reply(content)
+
+    def typing(self):
+        return FakeTyping()
+
+
+class FakeBot:
+    async def change_presence(self, **_):
+        pass
+
+
+def write_config(path: str, args: argparse.Namespace, base_url: str):
+    config = {
+        "discord": {"bot_prefix": "!", "case_insensitive": True, "token": None},
+        "modules": {
+            "ai": {
+                "api_key": "stub",
+                "assistant_id": "asst_stub",
+                "base_url": base_url,
+                "thread_id": None,
+                "allowed_roles": [],
+                "main_role": 0,
+                "workers": args.workers,
+                "streaming": args.streaming,
+                "max_requests": args.requests * 10,
+                "user_requests": args.requests * 10,
+                "queue_deadline": 0,
+                "thread_scope": args.thread_scope,
+                "thread_max_messages": 0,
+                "thread_max_tokens": 0,
+            },
+        },
+    }
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as file:
+        yaml.dump(config, file)
+
+
+async def run(args: argparse.Namespace):
+    server = server_from_arguments(args)
+    await server.start()
+
+    workdir = tempfile.mkdtemp(prefix="ai_load_")
+    os.chdir(workdir)  # logs and saved state of the cog go here
+    config_path = os.path.join(workdir, "settings", "config.yaml")
+    write_config(config_path, args, server.base_url)
+    os.environ["DISORD_CONFIG_PATH"] = config_path
+
+    from modules import ai  # noqa: E402  (reads the config on import)
+    ai.logger.disabled = True
+
+    cog = ai.Ai(FakeBot())
+    await cog.cog_load()
+    cog._Ai__is_switched_on = True
+
+    users = [FakeMember(user_id) for user_id in range(1, args.users + 1)]
+    channels = [FakeChannel(channel_id) for channel_id in range(1, args.channels + 1)]
+    contexts: list[FakeContext] = []
+    started = time.perf_counter()
+    for index in range(args.requests):
+        ctx = FakeContext(random.choice(users), random.choice(channels))
+        if contexts and random.random() < args.duplicates:
+            prompt = f"Вопрос номер {random.randrange(index)}"
+        else:
+            prompt = f"Вопрос номер {index}"
+        contexts.append(ctx)
+        await cog.prompt.callback(cog, ctx, prompt_message=prompt)
+        if args.rate:
+            await asyncio.sleep(1 / args.rate)
+
+    pool = cog._Ai__pool
+    await pool.join()
+    # The tails of long replies are still going out in the background.
+    sender = cog._Ai__sender
+    while sender.pending:
+        await asyncio.sleep(0.05)
+    elapsed = time.perf_counter() - started
+    await cog.cog_unload()
+    await server.stop()
+
+    answered = [ctx for ctx in contexts if ctx.last_reply_at is not None]
+    total = [ctx.last_reply_at - ctx.sent_at for ctx in answered]
+    first = [ctx.first_reply_at - ctx.sent_at for ctx in answered]
+    print(f"{args.requests} prompts, {args.workers} workers, scope {args.thread_scope}, "
+          f"{'streaming' if args.streaming else 'polling'}, run latency {args.latency:.2f}s")
+    print(f"answered:        {len(answered):10d} ({sum(ctx.replies for ctx in contexts)} messages)")
+    print(f"prompts/s:       {len(answered) / elapsed:10.2f}")
+    print(f"openai runs:     {server.runs:10d} (max {server.max_active_runs} at once, "
+          f"{server.requests} HTTP requests)")
+    print(f"queue wait avg:  {pool.average_wait:10.3f} s, max {pool.max_wait:.3f} s")
+    print(f"first reply p50: {percentile(first, 0.50):10.3f} s, p99 {percentile(first, 0.99):.3f} s")
+    print(f"end-to-end p50:  {percentile(total, 0.50):10.3f} s, p99 {percentile(total, 0.99):.3f} s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--rate", type=float, default=0.0, help="prompts per second, 0 - all at once")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--channels", type=int, default=4)
+    parser.add_argument("--streaming", action="store_true")
+    parser.add_argument("--thread-scope", choices=("shared", "channel", "user"), default="shared")
+    parser.add_argument("--duplicates", type=float, default=0.0,
+                        help="share of prompts repeating an earlier one")
+    add_server_arguments(parser)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Throughput of the AI worker pool against a stub backend.
+
+Each request sleeps for ``--latency`` seconds, standing in for an Assistants
+run on its own thread; the script reports requests/s and queue wait for
+several worker counts. It measures the pool only: the stub takes no thread
+lock, so with ``thread_scope: shared`` (one run at a time) real throughput
+stays at one run per latency whatever the worker count. Use ``ai_load.py``
+for the whole cog against the fake OpenAI server.
+
+Usage (from the repository root):
+
+    python benchmarks/ai_workers.py [--requests 40] [--latency 0.2] [--workers 1 2 4 8]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app"))
+
+from modules.plugins.worker_pool import WorkerPool  # noqa: E402
+
+
+async def measure(workers: int, requests: int, latency: float) -> tuple[float, float, float]:
+    async def stub_backend(_):
+        await asyncio.sleep(latency)
+
+    pool = WorkerPool(stub_backend, workers)
+    pool.start()
+    started = time.perf_counter()
+    for index in range(requests):
+        await pool.submit(index)
+    await pool.join()
+    elapsed = time.perf_counter() - started
+    await pool.stop()
+    return requests / elapsed, pool.average_wait, pool.max_wait
+
+
+async def run(args: argparse.Namespace):
+    print(f"{args.requests} requests, {args.latency * 1e3:.0f} ms per request")
+    print("pool only: every request runs as if on its own thread; shared-thread runs are "
+          "serialized, see ai_load.py")
+    print(f"{'workers':>8} {'req/s':>10} {'avg wait, s':>12} {'max wait, s':>12}")
+    for workers in args.workers:
+        throughput, average_wait, max_wait = await measure(workers, args.requests, args.latency)
+        print(f"{workers:>8} {throughput:>10.1f} {average_wait:>12.2f} {max_wait:>12.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=40)
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+"""Local stand-in for a DreamDaemon server speaking the 0x83 Topic() protocol.
+
+Replays recorded ``?status``/``?playing`` responses and can inject latency,
+fragmented writes, connection resets and refused connections. It is used by
+the Topic() benchmarks and can also be run on its own to point the bot at:
+
+    python benchmarks/fake_dreamdaemon.py --port 51143 [--latency 0.05] [--recording FILE]
+
+A recording is a JSON object mapping a query to a response, e.g.
+``{"?status": {"type": "string", "data": "gamestate=3&players=12"},
+"?playing": {"type": "float", "data": 12}}``.
+"""
+import argparse
+import asyncio
+import json
+import random
+import struct
+
+TOPIC_PACKET_ID = 0x83
+TOPIC_RESPONSE_STRING = b"\x06"
+TOPIC_RESPONSE_FLOAT = b"\x2a"
+
+DEFAULT_RECORDING = {
+    "?status": {
+        "type": "string",
+        "data": "version=Rockhill&mode=secret&respawn=0&enter=1&vote=1&ai=1&host=&round_id=1312"
+                "&players=24&revision=0123456789abcdef0123456789abcdef01234567&admins=2"
+                "&gamestate=3&map_name=Box+Station&security_level=green&round_duration=2750"
+                "&time_dilation_current=0.2&shuttle_mode=idle&shuttle_timer=0",
+    },
+    "?playing": {"type": "float", "data": 24},
+}
+
+
+def encode_response(response: dict) -> bytes:
+    if response["type"] == "float":
+        content = TOPIC_RESPONSE_FLOAT + struct.pack("<f", float(response["data"]))
+    else:
+        content = TOPIC_RESPONSE_STRING + response["data"].encode("utf8") + b"\x00"
+    return struct.pack(">xBH", TOPIC_PACKET_ID, len(content)) + content
+
+
+class FakeDreamDaemon:
+    def __init__(self, host="127.0.0.1", port=0, recording: dict | None = None,
+                 latency=0.0, jitter=0.0, fragment_size=0, fragment_delay=0.0,
+                 reset_rate=0.0, keep_alive=True):
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.jitter = jitter
+        self.fragment_size = fragment_size
+        self.fragment_delay = fragment_delay
+        self.reset_rate = reset_rate
+        self.keep_alive = keep_alive
+        self.requests = 0
+        self.connections = 0
+        self.__responses = {
+            query: encode_response(response)
+            for query, response in (recording or DEFAULT_RECORDING).items()
+        }
+        self.__server: asyncio.base_events.Server | None = None
+        self.__handlers: dict[asyncio.Task, asyncio.StreamWriter] = {}
+
+    def set_response(self, query: str, response: dict):
+        self.__responses[query] = encode_response(response)
+
+    async def start(self):
+        self.__server = await asyncio.start_server(self.__handle, self.host, self.port)
+        self.port = self.__server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        if self.__server is not None:
+            self.__server.close()
+            self.__server = None
+        # Drop open connections so their handlers exit on their own instead of being cancelled.
+        for writer in self.__handlers.values():
+            writer.transport.abort()
+        if self.__handlers:
+            await asyncio.wait(list(self.__handlers), timeout=1.0)
+
+    async def refuse(self):
+        """Stop listening so new connections are refused, as when DreamDaemon is down."""
+        await self.stop()
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.stop()
+
+    async def __handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        task = asyncio.current_task()
+        self.__handlers[task] = writer
+        try:
+            await self.__serve_connection(reader, writer)
+        finally:
+            del self.__handlers[task]
+
+    async def __serve_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+        try:
+            while True:
+                try:
+                    header = await reader.readexactly(4)
+                except asyncio.IncompleteReadError:
+                    break
+                (size,) = struct.unpack(">H", header[2:])
+                body = await reader.readexactly(size)
+                # 5 pad bytes, then the NUL terminated query string.
+                query = body[5:].rstrip(b"\x00").decode("utf8")
+                self.requests += 1
+
+                if self.reset_rate and random.random() < self.reset_rate:
+                    writer.transport.abort()
+                    return
+                if self.latency or self.jitter:
+                    await asyncio.sleep(self.latency + random.uniform(0, self.jitter))
+
+                await self.__write(writer, self.__responses.get(query) or encode_response(
+                    {"type": "string", "data": ""}))
+                if not self.keep_alive:
+                    break
+        except ConnectionError:
+            return
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except ConnectionError:
+            pass
+
+    async def __write(self, writer: asyncio.StreamWriter, packet: bytes):
+        if not self.fragment_size:
+            writer.write(packet)
+            await writer.drain()
+            return
+        for start in range(0, len(packet), self.fragment_size):
+            writer.write(packet[start:start + self.fragment_size])
+            await writer.drain()
+            if self.fragment_delay:
+                await asyncio.sleep(self.fragment_delay)
+
+
+def add_server_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--recording", help="JSON file with recorded responses")
+    parser.add_argument("--latency", type=float, default=0.0, help="response delay, seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="random extra delay, seconds")
+    parser.add_argument("--fragment-size", type=int, default=0,
+                        help="split responses into writes of this many bytes")
+    parser.add_argument("--fragment-delay", type=float, default=0.0,
+                        help="delay between fragments, seconds")
+    parser.add_argument("--reset-rate", type=float, default=0.0,
+                        help="probability of resetting the connection instead of answering")
+    parser.add_argument("--close", action="store_true",
+                        help="close the connection after each response")
+
+
+def server_from_arguments(args: argparse.Namespace, host="127.0.0.1", port=0) -> FakeDreamDaemon:
+    recording = None
+    if args.recording:
+        with open(args.recording) as file:
+            recording = json.load(file)
+    return FakeDreamDaemon(
+        host=host,
+        port=port,
+        recording=recording,
+        latency=args.latency,
+        jitter=args.jitter,
+        fragment_size=args.fragment_size,
+        fragment_delay=args.fragment_delay,
+        reset_rate=args.reset_rate,
+        keep_alive=not args.close,
+    )
+
+
+async def serve(args: argparse.Namespace):
+    server = server_from_arguments(args, host=args.host, port=args.port)
+    await server.start()
+    print(f"Fake DreamDaemon listening on {server.host}:{server.port}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=51143)
+    add_server_arguments(parser)
+    try:
+        asyncio.run(serve(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,348 @@
+"""Local stand-in for the OpenAI Assistants endpoints used by the AI module.
+
+Serves assistants, threads, messages and runs (polled or streamed over SSE)
+from memory. A run completes ``--latency`` seconds after it is created and
+answers with a canned reply, so the bot can be exercised without spending
+API credit. Point ``ai.base_url`` at it, e.g.
+
+    python benchmarks/fake_openai.py --port 8131 [--latency 1.0] [--reply-words 60]
+
+and set ``base_url: http://127.0.0.1:8131/v1`` in the ai section of the config.
+Like the real API, a thread accepts no new messages while one of its runs is
+active, so lock mistakes in the client show up as 400 errors.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import time
+
+from aiohttp import web
+
+DEFAULT_REPLY = ("Станция живёт своей жизнью: инженеры чинят двигатель, медики спорят о "
+                 "страховке, а капитан снова потерял диск с кодами. ")
+
+
+class FakeOpenAI:
+    def __init__(self, host="127.0.0.1", port=0, latency=1.0, jitter=0.0,
+                 reply_words=60, chunk_words=3, poll_interval_ms=50, fail_rate=0.0):
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.jitter = jitter
+        self.reply_words = reply_words
+        self.chunk_words = chunk_words
+        self.poll_interval_ms = poll_interval_ms
+        self.fail_rate = fail_rate
+        self.failed_runs = 0
+        self.runs = 0
+        self.requests = 0
+        self.active_runs = 0
+        self.max_active_runs = 0
+        self.__ids = itertools.count(1)
+        self.__threads: dict[str, dict] = {}
+        self.__runs: dict[str, dict] = {}
+        self.__runner: web.AppRunner | None = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}/v1"
+
+    async def start(self):
+        app = web.Application(middlewares=[self.__count])
+        app.router.add_get("/v1/assistants/{assistant_id}", self.__get_assistant)
+        app.router.add_post("/v1/threads", self.__create_thread)
+        app.router.add_get("/v1/threads/{thread_id}", self.__get_thread)
+        app.router.add_delete("/v1/threads/{thread_id}", self.__delete_thread)
+        app.router.add_post("/v1/threads/{thread_id}/messages", self.__create_message)
+        app.router.add_get("/v1/threads/{thread_id}/messages", self.__list_messages)
+        app.router.add_post("/v1/threads/{thread_id}/runs", self.__create_run)
+        app.router.add_get("/v1/threads/{thread_id}/runs/{run_id}", self.__get_run)
+        self.__runner = web.AppRunner(app, access_log=None)
+        await self.__runner.setup()
+        site = web.TCPSite(self.__runner, self.host, self.port)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        if self.__runner is not None:
+            await self.__runner.cleanup()
+            self.__runner = None
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.stop()
+
+    @web.middleware
+    async def __count(self, request: web.Request, handler):
+        self.requests += 1
+        return await handler(request)
+
+    def __new_id(self, prefix: str) -> str:
+        return f"{prefix}_{next(self.__ids):08d}"
+
+    def __reply_text(self) -> str:
+        words = (DEFAULT_REPLY * (self.reply_words // 10 + 1)).split()[:self.reply_words]
+        return " ".join(words)
+
+    @staticmethod
+    def __error(status: int, message: str) -> web.Response:
+        return web.json_response({"error": {"message": message, "type": "invalid_request_error"}},
+                                 status=status)
+
+    def __thread_or_404(self, request: web.Request) -> dict | None:
+        return self.__threads.get(request.match_info["thread_id"])
+
+    def __message(self, thread_id: str, role: str, text: str, run_id: str | None = None) -> dict:
+        return {
+            "id": self.__new_id("msg"),
+            "object": "thread.message",
+            "created_at": int(time.time()),
+            "thread_id": thread_id,
+            "role": role,
+            "content": [{"type": "text", "text": {"value": text, "annotations": []}}] if text else [],
+            "assistant_id": "asst_stub" if role == "assistant" else None,
+            "run_id": run_id,
+            "status": "completed",
+            "attachments": [],
+            "metadata": {},
+        }
+
+    async def __get_assistant(self, request: web.Request) -> web.Response:
+        return web.json_response({
+            "id": request.match_info["assistant_id"],
+            "object": "assistant",
+            "created_at": int(time.time()),
+            "name": "Stub",
+            "model": "stub",
+            "instructions": None,
+            "description": None,
+            "tools": [],
+            "metadata": {},
+        })
+
+    async def __create_thread(self, request: web.Request) -> web.Response:
+        body = await request.json() if request.can_read_body else {}
+        thread_id = self.__new_id("thread")
+        thread = {"id": thread_id, "messages": [], "active_run": None}
+        for message in body.get("messages") or []:
+            thread["messages"].append(self.__message(thread_id, message["role"], message["content"]))
+        self.__threads[thread_id] = thread
+        return web.json_response(self.__thread_object(thread_id))
+
+    @staticmethod
+    def __thread_object(thread_id: str) -> dict:
+        return {"id": thread_id, "object": "thread", "created_at": int(time.time()), "metadata": {}}
+
+    async def __get_thread(self, request: web.Request) -> web.Response:
+        if self.__thread_or_404(request) is None:
+            return self.__error(404, "No thread found")
+        return web.json_response(self.__thread_object(request.match_info["thread_id"]))
+
+    async def __delete_thread(self, request: web.Request) -> web.Response:
+        thread_id = request.match_info["thread_id"]
+        if self.__threads.pop(thread_id, None) is None:
+            return self.__error(404, "No thread found")
+        return web.json_response({"id": thread_id, "object": "thread.deleted", "deleted": True})
+
+    async def __create_message(self, request: web.Request) -> web.Response:
+        thread = self.__thread_or_404(request)
+        if thread is None:
+            return self.__error(404, "No thread found")
+        if thread["active_run"] is not None:
+            return self.__error(400, f"Can't add messages to {thread['id']} while a run "
+                                     f"{thread['active_run']} is active.")
+        body = await request.json()
+        message = self.__message(thread["id"], body.get("role", "user"), body["content"])
+        thread["messages"].append(message)
+        return web.json_response(message)
+
+    async def __list_messages(self, request: web.Request) -> web.Response:
+        thread = self.__thread_or_404(request)
+        if thread is None:
+            return self.__error(404, "No thread found")
+        messages = thread["messages"]
+        run_id = request.query.get("run_id")
+        if run_id:
+            messages = [message for message in messages if message["run_id"] == run_id]
+        if request.query.get("order", "desc") == "desc":
+            messages = messages[::-1]
+        messages = messages[:int(request.query.get("limit", 20))]
+        return web.json_response({
+            "object": "list",
+            "data": messages,
+            "first_id": messages[0]["id"] if messages else None,
+            "last_id": messages[-1]["id"] if messages else None,
+            "has_more": False,
+        })
+
+    def __run_object(self, run: dict) -> dict:
+        prompt_tokens = sum(len(message["content"][0]["text"]["value"].split())
+                            for message in self.__threads.get(run["thread_id"], {}).get("messages", [])
+                            if message["content"])
+        return {
+            "id": run["id"],
+            "object": "thread.run",
+            "created_at": int(run["created_at"]),
+            "thread_id": run["thread_id"],
+            "assistant_id": run["assistant_id"],
+            "status": run["status"],
+            "model": "stub",
+            "instructions": "",
+            "tools": [],
+            "metadata": {},
+            "parallel_tool_calls": True,
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": self.reply_words,
+                "total_tokens": prompt_tokens + self.reply_words,
+            } if run["status"] == "completed" else None,
+        }
+
+    def __start_run(self, thread: dict, assistant_id: str) -> dict:
+        run = {
+            "id": self.__new_id("run"),
+            "thread_id": thread["id"],
+            "assistant_id": assistant_id,
+            "created_at": time.time(),
+            "duration": self.latency + random.uniform(0, self.jitter),
+            "status": "queued",
+            "fails": random.random() < self.fail_rate,
+        }
+        self.__runs[run["id"]] = run
+        thread["active_run"] = run["id"]
+        self.runs += 1
+        self.active_runs += 1
+        self.max_active_runs = max(self.max_active_runs, self.active_runs)
+        return run
+
+    def __finish_run(self, run: dict) -> dict | None:
+        run["status"] = "failed" if run["fails"] else "completed"
+        self.active_runs -= 1
+        thread = self.__threads.get(run["thread_id"])
+        if thread is None:
+            return None
+        thread["active_run"] = None
+        if run["fails"]:
+            self.failed_runs += 1
+            return None
+        message = self.__message(thread["id"], "assistant", self.__reply_text(), run["id"])
+        thread["messages"].append(message)
+        return message
+
+    async def __create_run(self, request: web.Request) -> web.StreamResponse:
+        thread = self.__thread_or_404(request)
+        if thread is None:
+            return self.__error(404, "No thread found")
+        if thread["active_run"] is not None:
+            return self.__error(400, f"Thread {thread['id']} already has an active run "
+                                     f"{thread['active_run']}.")
+        body = await request.json()
+        run = self.__start_run(thread, body.get("assistant_id", "asst_stub"))
+        if body.get("stream"):
+            return await self.__stream_run(request, thread, run)
+        return web.json_response(self.__run_object(run),
+                                 headers={"openai-poll-after-ms": str(self.poll_interval_ms)})
+
+    async def __get_run(self, request: web.Request) -> web.Response:
+        run = self.__runs.get(request.match_info["run_id"])
+        if run is None:
+            return self.__error(404, "No run found")
+        if run["status"] not in ("completed", "failed"):
+            if time.time() - run["created_at"] >= run["duration"]:
+                self.__finish_run(run)
+            else:
+                run["status"] = "in_progress"
+        return web.json_response(self.__run_object(run),
+                                 headers={"openai-poll-after-ms": str(self.poll_interval_ms)})
+
+    async def __stream_run(self, request: web.Request, thread: dict, run: dict) -> web.StreamResponse:
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await response.prepare(request)
+
+        async def send(event: str, data: dict | str):
+            payload = data if isinstance(data, str) else json.dumps(data)
+            await response.write(f"event: {event}\ndata: {payload}\n\n".encode("utf8"))
+
+        await send("thread.run.created", self.__run_object(run))
+        run["status"] = "in_progress"
+        await send("thread.run.in_progress", self.__run_object(run))
+
+        words = self.__reply_text().split()
+        chunks = [" ".join(words[start:start + self.chunk_words]) + " "
+                  for start in range(0, len(words), self.chunk_words)]
+        draft = self.__message(thread["id"], "assistant", "", run["id"])
+        draft["status"] = "in_progress"
+        await send("thread.message.created", draft)
+        delay = run["duration"] / max(1, len(chunks))
+        if run["fails"]:
+            # A failing run breaks off halfway through the reply.
+            chunks = chunks[:len(chunks) // 2]
+        for chunk in chunks:
+            await asyncio.sleep(delay)
+            await send("thread.message.delta", {
+                "id": draft["id"],
+                "object": "thread.message.delta",
+                "delta": {"content": [{"index": 0, "type": "text", "text": {"value": chunk}}]},
+            })
+
+        message = self.__finish_run(run)
+        if message is not None:
+            await send("thread.message.completed", message)
+        await send(f"thread.run.{run['status']}", self.__run_object(run))
+        await send("done", "[DONE]")
+        await response.write_eof()
+        return response
+
+
+def add_server_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--latency", type=float, default=1.0, help="seconds until a run completes")
+    parser.add_argument("--jitter", type=float, default=0.0, help="random extra run time, seconds")
+    parser.add_argument("--reply-words", type=int, default=60, help="length of the canned reply")
+    parser.add_argument("--chunk-words", type=int, default=3, help="words per streamed delta")
+    parser.add_argument("--poll-interval-ms", type=int, default=50,
+                        help="poll interval suggested to the client")
+    parser.add_argument("--fail-rate", type=float, default=0.0,
+                        help="share of runs that end with status 'failed'")
+
+
+def server_from_arguments(args: argparse.Namespace, host="127.0.0.1", port=0) -> FakeOpenAI:
+    return FakeOpenAI(
+        host=host,
+        port=port,
+        latency=args.latency,
+        jitter=args.jitter,
+        reply_words=args.reply_words,
+        chunk_words=args.chunk_words,
+        poll_interval_ms=args.poll_interval_ms,
+        fail_rate=args.fail_rate,
+    )
+
+
+async def serve(args: argparse.Namespace):
+    server = server_from_arguments(args, host=args.host, port=args.port)
+    await server.start()
+    print(f"Fake OpenAI listening on {server.base_url}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8131)
+    add_server_arguments(parser)
+    try:
+        asyncio.run(serve(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
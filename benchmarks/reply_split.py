@@ -0,0 +1,59 @@
+"""Fuzz check and micro-benchmark for splitting long AI replies.
+
+Feeds random replies (paragraphs, long lines, code blocks) through
+``split_message`` and fails if any chunk is over the limit, then reports
+the per-reply splitting cost.
+
+Usage (from the repository root):
+
+    python benchmarks/reply_split.py [--cases 3000] [--limit 2000] [--seed 0]
+"""
+import argparse
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app"))
+
+from modules.plugins.reply_splitter import split_message  # noqa: E402
+
+
+def make_reply(rng: random.Random, limit: int) -> str:
+    blocks = []
+    for _ in range(rng.randint(1, 12)):
+        kind = rng.random()
+        if kind < 0.2:
+            lines = [rng.choice("xyz") * rng.randint(0, limit // 8) for _ in range(rng.randint(1, 30))]
+            blocks.append(f"```{rng.choice(['', 'python', 'yaml'])}\n" + "\n".join(lines) + "\n```")
+        elif kind < 0.4:
+            blocks.append(rng.choice("abc") * rng.randint(limit // 2, limit * 2))
+        else:
+            words = [rng.choice("abcd") * rng.randint(1, 12) for _ in range(rng.randint(1, limit // 4))]
+            blocks.append(" ".join(words) if rng.random() < 0.5 else "\n".join(words))
+    return rng.choice(["\n\n", "\n"]).join(blocks)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cases", type=int, default=3000)
+    parser.add_argument("--limit", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    replies = [make_reply(rng, args.limit) for _ in range(args.cases)]
+    chunks = 0
+    for reply in replies:
+        for chunk in split_message(reply, args.limit):
+            assert len(chunk) <= args.limit, (len(chunk), reply[:80])
+            chunks += 1
+
+    best = min(timeit.repeat(lambda: [split_message(reply, args.limit) for reply in replies],
+                             number=1, repeat=3))
+    print(f"{args.cases} replies, {chunks} chunks, none over {args.limit} characters")
+    print(f"split_message: {best / args.cases * 1e6:8.2f} us/reply")
+
+
+if __name__ == "__main__":
+    main()
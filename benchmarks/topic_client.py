@@ -0,0 +1,78 @@
+"""Load benchmark for the Topic() client path against a local fake DreamDaemon.
+
+Measures queries per second and p50/p99 latency of ``TopicClient.query_status``
+(the call the roundstatus poller makes), optionally under injected latency,
+fragmentation and connection resets.
+
+Usage (from the repository root):
+
+    python benchmarks/topic_client.py [--concurrency 8] [--duration 5] [--close]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app"))
+
+from fake_dreamdaemon import add_server_arguments, server_from_arguments  # noqa: E402
+from modules.plugins import byond_topic  # noqa: E402
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+async def run(args: argparse.Namespace):
+    server = server_from_arguments(args)
+    await server.start()
+    client = byond_topic.TopicClient(
+        "127.0.0.1", server.port,
+        max_concurrency=args.concurrency,
+        max_idle=args.concurrency,
+    )
+    latencies: list[float] = []
+    errors = 0
+    deadline = time.perf_counter() + args.duration
+
+    async def worker():
+        nonlocal errors
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            try:
+                snapshot = await client.query_status()
+                snapshot.players
+            except Exception:
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+    elapsed = time.perf_counter() - started
+    await client.close()
+    await server.stop()
+
+    print(f"concurrency {args.concurrency}, {elapsed:.1f}s, "
+          f"server connections {server.connections}, requests {server.requests}")
+    print(f"queries/s: {len(latencies) / elapsed:10.1f}")
+    print(f"p50:       {percentile(latencies, 0.50) * 1e3:10.3f} ms")
+    print(f"p99:       {percentile(latencies, 0.99) * 1e3:10.3f} ms")
+    print(f"errors:    {errors:10d}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=5.0)
+    add_server_arguments(parser)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Micro-benchmark: per-packet cost of decoding a Topic() ?status response.
+
+Compares the legacy ``reader.read`` + ``struct.unpack`` + ``parse_qs`` path
+with the framing done by ``modules.plugins.byond_topic.read_packet`` and with
+the lazily decoded ``RoundStatusSnapshot`` reading the fields the poller uses.
+
+Usage (from the repository root):
+
+    python benchmarks/topic_decode.py [--players N] [--number N]
+"""
+import argparse
+import os
+import struct
+import sys
+import timeit
+import urllib.parse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app"))
+
+from modules.plugins import byond_topic  # noqa: E402
+
+
+def make_status_packet(players: int) -> bytes:
+    fields = {
+        "version": "/tg/station 13",
+        "mode": "secret",
+        "respawn": "0",
+        "enter": "1",
+        "vote": "1",
+        "ai": "1",
+        "host": "",
+        "round_id": "4242",
+        "players": str(players),
+        "revision": "a" * 40,
+        "admins": "3",
+        "gamestate": "3",
+        "map_name": "Box Station",
+        "security_level": "green",
+        "round_duration": "3725",
+        "time_dilation_current": "0.5",
+        "shuttle_mode": "idle",
+        "shuttle_timer": "0",
+    }
+    for index in range(players):
+        fields[f"player{index}"] = f"Player Name {index}"
+    body = urllib.parse.urlencode(fields).encode() + b"\x00"
+    content = byond_topic.TOPIC_RESPONSE_STRING + body
+    return b"\x00" + byond_topic.TOPIC_PACKET_ID + struct.pack(">H", len(content)) + content
+
+
+def legacy_decode(packet: bytes):
+    # Mirrors the original byond_topic.send receive loop.
+    recvPacketId, content_len, response_type = struct.unpack(">xcHc", packet[:5])
+    content_len -= 2
+    response = packet[5:5 + content_len]
+    return urllib.parse.parse_qs(str(response, encoding="utf8"), keep_blank_values=True)
+
+
+def framed_packet(packet: bytes) -> byond_topic.TopicPacket:
+    # What read_packet does with the header and body it got from readexactly().
+    header, body = packet[:byond_topic.RESPONSE_HEADER_SIZE], packet[byond_topic.RESPONSE_HEADER_SIZE:]
+    response_type, content_len = byond_topic._parse_header(header)
+    return byond_topic._make_packet(response_type, body[:content_len])
+
+
+def framed_decode(packet: bytes):
+    return framed_packet(packet).decode()
+
+
+def legacy_tick_fields(packet: bytes):
+    data = legacy_decode(packet)
+    return (int(data["round_duration"][0]), int(data["gamestate"][0]), data["players"][0])
+
+
+def snapshot_tick_fields(packet: bytes):
+    snapshot = byond_topic.RoundStatusSnapshot(framed_packet(packet).payload)
+    return (snapshot.round_duration, snapshot.gamestate, snapshot.players)
+
+
+def framed_only(packet: bytes):
+    return framed_packet(packet).payload
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--players", type=int, default=80)
+    parser.add_argument("--number", type=int, default=20000)
+    args = parser.parse_args()
+
+    packet = make_status_packet(args.players)
+    assert legacy_decode(packet) == framed_decode(packet)
+    legacy_fields = legacy_tick_fields(packet)
+    assert snapshot_tick_fields(packet) == (
+        legacy_fields[0], legacy_fields[1], int(legacy_fields[2]))
+
+    cases = {
+        "legacy read+parse_qs": lambda: legacy_decode(packet),
+        "framed read+parse_qs": lambda: framed_decode(packet),
+        "framing only": lambda: framed_only(packet),
+        "legacy tick fields": lambda: legacy_tick_fields(packet),
+        "snapshot tick fields": lambda: snapshot_tick_fields(packet),
+    }
+    print(f"packet size: {len(packet)} bytes, {args.number} iterations")
+    for name, case in cases.items():
+        best = min(timeit.repeat(case, number=args.number, repeat=5))
+        print(f"{name:<26} {best / args.number * 1e6:8.2f} us/packet")
+
+
+if __name__ == "__main__":
+    main()